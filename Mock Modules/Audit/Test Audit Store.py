@@ -0,0 +1,59 @@
+"""
+test_audit_store.py
+
+Generic round-trip tests for audit.AuditSegmentStore and AuditPipeline, including several writer processes
+sharing one audit directory. Uses a scratch directory, never the live audit log.
+Drafted collaboratively with Bob Greenwade and Copilot.
+"""
+
+import json
+import multiprocessing
+import shutil
+import tempfile
+from audit import AuditPipeline, AuditSegmentStore
+
+def make_entry(i, user="alice"):
+    return {"timestamp": "2025-01-01T00:00:00", "event": "note", "user": user, "details": {"i": i}}
+
+def write_entries(directory, user, count):
+    pipeline = AuditPipeline(directory, max_bytes=4096, max_segments=None, max_total_bytes=None)
+    for i in range(count):
+        pipeline.submit(make_entry(i, user))
+    pipeline.close()
+
+def test_write_query_roundtrip():
+    directory = tempfile.mkdtemp(prefix="dli_audit_test_")
+    try:
+        store = AuditSegmentStore(directory, max_bytes=4096, max_segments=None, max_total_bytes=None)
+        entries = [make_entry(i, "alice" if i % 2 else "bob") for i in range(200)]
+        store.write([(entry, (json.dumps(entry) + "\n").encode("utf-8")) for entry in entries])
+        store.close()
+        assert len(store.segments()) > 1, "Entries past max_bytes should roll over to new parts"
+        found = list(store.query(user="alice"))
+        assert [e["details"]["i"] for e in found] == list(range(1, 200, 2)), "Query should return alice's entries in order"
+        assert store.count(event="note") == 200
+        print("✅ test_write_query_roundtrip passed.")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+def test_multiprocess_writers():
+    directory = tempfile.mkdtemp(prefix="dli_audit_test_")
+    try:
+        users = ["p0", "p1", "p2"]
+        workers = [multiprocessing.Process(target=write_entries, args=(directory, user, 500)) for user in users]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        store = AuditSegmentStore(directory, max_segments=None, max_total_bytes=None)
+        assert store.count() == 1500
+        for user in users:
+            found = list(store.query(user=user))
+            assert len(found) == 500 and all(e["user"] == user for e in found), f"Offsets for {user} should be intact"
+        print("✅ test_multiprocess_writers passed.")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == "__main__":
+    test_write_query_roundtrip()
+    test_multiprocess_writers()
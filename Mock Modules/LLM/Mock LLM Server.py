@@ -0,0 +1,80 @@
+"""
+mock_llm_server.py
+
+Local stub for the llm.endpoint in config.json, for testing llm.py and paraphrase.py without a real model.
+Answers POST /paraphrase with {"paraphrased": "..."} and can simulate latency and transient failures.
+Drafted collaboratively with Bob Greenwade and Copilot.
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, so connection pooling can be observed
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+
+        with server.lock:
+            server.request_count += 1
+            server.connections.add(self.client_address)
+            fail = server.fail_next > 0 or random.random() < server.failure_rate
+            if server.fail_next > 0:
+                server.fail_next -= 1
+
+        if server.delay:
+            time.sleep(server.delay)
+
+        if fail:
+            self._reply(503, {"error": "mock overload"})
+            return
+
+        prompt = payload.get("prompt", "")
+        original = prompt.split('Original: "', 1)[-1].split('"', 1)[0] if 'Original: "' in prompt else prompt
+        self._reply(200, {"paraphrased": f"[mock {payload.get('model', 'llm')}] {original}"})
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client gave up (e.g., a timeout test)
+
+    def log_message(self, format, *args):
+        pass  # Keep test output quiet
+
+def start_mock_llm_server(port=0, delay=0.0, failure_rate=0.0, fail_next=0):
+    """
+    Starts the stub server in a background thread.
+    port: 0 picks a free port; delay: seconds per response; failure_rate: chance of a 503;
+    fail_next: number of upcoming requests that fail with 503.
+    Returns (server, endpoint URL). Call server.shutdown() when done.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), MockLLMHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.request_count = 0
+    server.connections = set()
+    server.delay = delay
+    server.failure_rate = failure_rate
+    server.fail_next = fail_next
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/paraphrase"
+
+if __name__ == "__main__":
+    server, endpoint = start_mock_llm_server(port=5000)
+    print(f"Mock LLM listening at {endpoint} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
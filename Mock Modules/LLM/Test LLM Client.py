@@ -0,0 +1,62 @@
+"""
+test_llm_client.py
+
+Generic tests for llm.py against mock_llm_server.py
+Drafted collaboratively with Bob Greenwade and Copilot.
+"""
+
+import asyncio
+import time
+from mock_llm_server import start_mock_llm_server
+from llm import LLMClient
+
+def test_keep_alive_pooling():
+    server, endpoint = start_mock_llm_server()
+    client = LLMClient(endpoint=endpoint)
+    for _ in range(10):
+        assert client.complete('Original: "hello"') == "[mock gpt-4] hello", "Should return the paraphrased text"
+    assert server.request_count == 10, "Every call should reach the server"
+    assert len(server.connections) == 1, "Sequential calls should reuse one keep-alive connection"
+    server.shutdown()
+    print("✅ test_keep_alive_pooling passed.")
+
+def test_retries_transient_failures():
+    server, endpoint = start_mock_llm_server(fail_next=2)
+    client = LLMClient(endpoint=endpoint, max_retries=2, backoff=0.01)
+    assert client.complete("retry me") is not None, "Two 503s should be retried"
+    assert client.get_stats()["retries"] == 2, "Both retries should be counted"
+
+    server.fail_next = 5
+    assert client.complete("give up") is None, "Should give up after max_retries"
+    server.shutdown()
+    print("✅ test_retries_transient_failures passed.")
+
+def test_timeout():
+    server, endpoint = start_mock_llm_server(delay=1.0)
+    client = LLMClient(endpoint=endpoint, timeout=0.2, max_retries=0)
+    start = time.perf_counter()
+    assert client.complete("slow") is None, "A slow endpoint should time out"
+    assert time.perf_counter() - start < 0.9, "Timeout should bound the wait"
+    server.shutdown()
+    print("✅ test_timeout passed.")
+
+def test_async_concurrency():
+    server, endpoint = start_mock_llm_server(delay=0.2)
+    client = LLMClient(endpoint=endpoint, max_concurrency=8)
+
+    async def run():
+        return await asyncio.gather(*(client.complete_async(f'Original: "{i}"') for i in range(8)))
+
+    start = time.perf_counter()
+    results = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+    assert results == [f"[mock gpt-4] {i}" for i in range(8)], "Results should come back in order"
+    assert elapsed < 1.0, "Eight concurrent calls should overlap rather than run back to back"
+    server.shutdown()
+    print("✅ test_async_concurrency passed.")
+
+if __name__ == "__main__":
+    test_keep_alive_pooling()
+    test_retries_transient_failures()
+    test_timeout()
+    test_async_concurrency()
@@ -0,0 +1,42 @@
+"""
+test_trigger_matcher.py
+
+Generic tests for semantics.TriggerMatcher against match_semantic() (requires the WordNet corpus)
+Drafted collaboratively with Bob Greenwade and Copilot.
+"""
+
+from semantics import TriggerMatcher, match_semantic
+
+CUES = {
+    "anger": ["hate", "angry"],
+    "joy": ["happy"],
+    "fear": ["afraid", "fall apart"]
+}
+
+def test_inflected_trigger_words():
+    matcher = TriggerMatcher({name: list(cues) for name, cues in CUES.items()})
+    result = matcher.match("i hated it and got angrier while they were happier")
+    assert result.get("anger") == ["hate", "angry"], "Inflected verbs and adjectives should fire their cues"
+    assert result.get("joy") == ["happy"], "Comparatives should fire their base cue"
+    print("✅ test_inflected_trigger_words passed.")
+
+def test_agrees_with_match_semantic():
+    matcher = TriggerMatcher({name: list(cues) for name, cues in CUES.items()})
+    for word in ["hated", "hates", "angrier", "happier", "scared", "frightened", "table"]:
+        for name, cues in CUES.items():
+            single = [c for c in cues if " " not in c]
+            fired = bool(matcher.match(word).get(name))
+            assert fired == match_semantic(word, single), f"'{word}' should match {name} exactly as match_semantic does"
+    print("✅ test_agrees_with_match_semantic passed.")
+
+def test_extend_recompiles():
+    matcher = TriggerMatcher({"anger": ["hate"]})
+    assert "anger" in matcher.match("hated")
+    matcher.extend("calm", ["relaxed"])
+    assert matcher.match("relaxed").get("calm") == ["relaxed"], "New cues should match after extend()"
+    print("✅ test_extend_recompiles passed.")
+
+if __name__ == "__main__":
+    test_inflected_trigger_words()
+    test_agrees_with_match_semantic()
+    test_extend_recompiles()
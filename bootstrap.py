@@ -8,6 +8,10 @@ Drafted collaboratively with Copilot.
 import nltk
 import os
 from phraseEditor import load_phrases
+from semantics import load_semantic_cache
+from paraphrase import preload_personas
+
+SEMANTIC_CACHE_FILE = os.getenv("DLI_SEMANTIC_CACHE", "semantic_cache.json")
 
 def initialize_nltk():
     """
@@ -35,11 +39,27 @@ def preload_editorial_assets():
     phrases = load_phrases()
     print(f"[BOOTSTRAP] Loaded {len(phrases)} mitigation phrases.")
 
+def preload_semantic_cache():
+    """
+    Warms the WordNet lemma/synonym cache from disk, if a warm file exists.
+    """
+    count = load_semantic_cache(SEMANTIC_CACHE_FILE)
+    print(f"[BOOTSTRAP] Warmed semantic cache with {count} entries.")
+
+def preload_persona_assets():
+    """
+    Reads every persona's backstory/directives once so the first paraphrase is served from cache.
+    """
+    count = preload_personas()
+    print(f"[BOOTSTRAP] Preloaded {count} personas.")
+
 def run_bootstrap():
     print("[BOOTSTRAP] Starting DLI initialization...")
     initialize_nltk()
     validate_environment()
     preload_editorial_assets()
+    preload_semantic_cache()
+    preload_persona_assets()
     print("[BOOTSTRAP] Initialization complete.")
 
 if __name__ == "__main__":
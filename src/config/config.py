@@ -1,9 +1,16 @@
 """
 config.py — User-facing configuration for behavior, preferences, and integrations.
+Also provides load_config(), a shared read-only view of config.json that reloads when the file changes.
 Used by location.py, generator.py, and other modules.
 Drafted collaboratively with Copilot.
 """
 
+import json
+import os
+import threading
+import time
+from types import MappingProxyType
+
 CONFIG = {
     "search_engine": "bing",               # Options: 'bing', 'google'
     "location_fallback": "ask",            # Options: 'ask', 'silent', 'block'
@@ -14,3 +21,109 @@ CONFIG = {
     "user_locale": "en-US",                # For localization and search relevance
     "enable_editorial_play": True          # Enables lyric generator, satire bots, etc.
 }
+
+# Shared config service for config.json
+
+def _default_config_path():
+    env_path = os.environ.get("DLI_CONFIG_PATH")
+    if env_path:
+        return env_path
+    if os.path.exists("config.json"):
+        return "config.json"
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
+
+def _freeze(value):
+    """Returns a read-only view of parsed JSON: dicts become mappings, lists become tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+class ConfigService:
+    """
+    Parses config.json once and shares an immutable snapshot (CONFIG defaults overlaid with the file).
+    The file is re-stat'ed at most every check_interval seconds and re-parsed only when its
+    mtime, inode, or size changes; subscribers are then called with (new_snapshot, old_snapshot).
+    A file that fails to parse leaves the previous snapshot in place.
+    """
+
+    def __init__(self, path=None, defaults=None, check_interval=1.0):
+        self.path = path or _default_config_path()
+        self.defaults = dict(defaults or {})
+        self.check_interval = check_interval
+        self._snapshot = _freeze(self.defaults)
+        self._signature = None
+        self._last_check = 0.0
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self.reloads = 0
+
+    def _file_signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_ino, st.st_size)
+
+    def snapshot(self):
+        """Returns the current snapshot, reloading first if the file changed."""
+        now = time.monotonic()
+        if now - self._last_check >= self.check_interval:
+            self._last_check = now
+            if self._file_signature() != self._signature:
+                self.reload()
+        return self._snapshot
+
+    def reload(self):
+        """Re-reads the file now and notifies subscribers if the snapshot changed."""
+        with self._lock:
+            signature = self._file_signature()
+            if signature is not None and signature == self._signature:
+                return self._snapshot
+            try:
+                data = {}
+                if signature is not None:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+            except Exception as e:
+                # Remember the bad file so it is retried only after it changes again
+                self._signature = signature
+                print(f"[CONFIG] Could not reload {self.path}: {e}")
+                return self._snapshot
+            old = self._snapshot
+            self._snapshot = _freeze({**self.defaults, **data})
+            self._signature = signature
+            self.reloads += 1
+            subscribers = list(self._subscribers)
+
+        if self.reloads == 1:
+            return self._snapshot  # Initial load, not a change
+        print(f"[CONFIG] Reloaded {self.path}")
+        for callback in subscribers:
+            try:
+                callback(self._snapshot, old)
+            except Exception as e:
+                print(f"[CONFIG] Subscriber failed: {e}")
+        return self._snapshot
+
+    def subscribe(self, callback):
+        """Registers callback(new_snapshot, old_snapshot), called after each reload."""
+        with self._lock:
+            self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+CONFIG_SERVICE = ConfigService(defaults=CONFIG)
+
+def load_config():
+    """Returns the shared, read-only config snapshot (cheap; reloads only when config.json changes)."""
+    return CONFIG_SERVICE.snapshot()
+
+def subscribe_config(callback):
+    """Calls callback(new_snapshot, old_snapshot) whenever config.json is reloaded."""
+    return CONFIG_SERVICE.subscribe(callback)
@@ -6,15 +6,19 @@ Returns escalation type, period metadata, editorial tone suggestion, and logs em
 Drafted collaboratively with Copilot and Bob Greenwade.
 """
 
-from emotion import analyze_emotion, map_emotion_to_tone
+from emotion import map_emotion_to_tone
+from features import as_features
 from datetime import datetime
 
 # Optional: external emotional profile log
 emotional_profile_log = []
 
 def detect_spike(current_text, previous_text, threshold=0.4):
-    current = analyze_emotion(current_text)
-    previous = analyze_emotion(previous_text)
+    """
+    Accepts raw text or TurnFeatures for either turn.
+    """
+    current = as_features(current_text).emotion
+    previous = as_features(previous_text).emotion
 
     delta_intensity = abs(current["intensity"] - previous["intensity"])
     delta_vector = sum(
@@ -57,13 +61,17 @@ def log_emotional_profile(user_id, emotion_data):
     })
 
 def detect_escalation(current_text, previous_text, emotion_history, time_history, user_id="default"):
+    current = as_features(current_text)
+    previous = as_features(previous_text)
+
     escalation_type = "none"
-    if detect_spike(current_text, previous_text):
+    if detect_spike(current, previous):
         escalation_type = "spike"
     elif detect_gradual_escalation(emotion_history):
         escalation_type = "gradual"
 
-    current_emotion = analyze_emotion(current_text)
+    current_emotion = current.emotion
+    previous_emotion = previous.emotion
     editorial_tone = map_emotion_to_tone(current_emotion["emotion_vector"])
     period = get_escalation_period(emotion_history, time_history)
 
@@ -73,9 +81,9 @@ def detect_escalation(current_text, previous_text, emotion_history, time_history
     return {
         "escalation_type": escalation_type,
         "period": period,
-        "delta_intensity": abs(current_emotion["intensity"] - analyze_emotion(previous_text)["intensity"]),
+        "delta_intensity": abs(current_emotion["intensity"] - previous_emotion["intensity"]),
         "delta_vector": sum(
-            abs(current_emotion["emotion_vector"][e] - analyze_emotion(previous_text)["emotion_vector"][e])
+            abs(current_emotion["emotion_vector"][e] - previous_emotion["emotion_vector"][e])
             for e in current_emotion["emotion_vector"]
         ),
         "editorial_tone": editorial_tone
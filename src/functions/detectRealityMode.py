@@ -6,8 +6,9 @@ Supports editorial modulation, synthetic empathy, escalation logic, and persona-
 Drafted collaboratively with Copilot and Bob Greenwade.
 """
 
-from semantics import match_wordlist, match_phrase
-from emotion import analyze_emotion
+from semantics import TriggerMatcher
+from automaton import PhraseAutomaton
+from features import as_features
 from learning import run_learning
 
 # Initial trigger sets (can be expanded by persona or ML)
@@ -21,11 +22,18 @@ REALITY_MODE_TRIGGERS = {
     "humor": ["just kidding", "lol", "that’s absurd", "sounds like a joke", "punchline", "satire"]
 }
 
+# Compiled lazily; both recompile whenever persona/ML expansion adds triggers
+REALITY_MODE_MATCHER = TriggerMatcher(REALITY_MODE_TRIGGERS)
+REALITY_MODE_PHRASES = PhraseAutomaton(REALITY_MODE_TRIGGERS)
+REALITY_MODE_MATCHER.subscribe(REALITY_MODE_PHRASES.invalidate)
+
 def classify_reality_mode(text, persona_profile=None):
     """
-    Returns dict with: mode, confidence, matched_terms, editorial_note, emotional_tone
+    Returns dict with: mode, confidence, scores, matched_terms, editorial_note, emotional_tone
+    Accepts raw text or TurnFeatures.
     """
-    lowered = text.lower()
+    turn = as_features(text)
+    lowered = turn.text.lower()
     scores = {}
     matched_terms = {}
 
@@ -34,10 +42,14 @@ def classify_reality_mode(text, persona_profile=None):
         expanded = run_learning("classification", persona_profile)
         # Placeholder: simulate trigger expansion
         for mode, new_terms in expanded.get("output", {}).items():
-            REALITY_MODE_TRIGGERS.setdefault(mode, []).extend(new_terms)
+            if isinstance(new_terms, list):
+                REALITY_MODE_MATCHER.extend(mode, new_terms)
 
-    for mode, triggers in REALITY_MODE_TRIGGERS.items():
-        matches = match_wordlist(lowered, triggers) + match_phrase(lowered, triggers)
+    word_matches = REALITY_MODE_MATCHER.match(lowered)
+    phrase_matches = REALITY_MODE_PHRASES.match(lowered)  # one scan across every mode
+    for mode in REALITY_MODE_TRIGGERS:
+        matches = word_matches.get(mode, [])
+        matches = matches + [t for t in phrase_matches.get(mode, []) if t not in matches]
         if matches:
             scores[mode] = len(matches)
             matched_terms[mode] = matches
@@ -46,9 +58,10 @@ def classify_reality_mode(text, persona_profile=None):
         return {
             "mode": "ambiguous",
             "confidence": 0.0,
+            "scores": {},
             "matched_terms": [],
             "editorial_note": "No clear mode detected",
-            "emotional_tone": analyze_emotion(text)["emotion_vector"]
+            "emotional_tone": turn.emotion_vector
         }
 
     # Select highest scoring mode
@@ -67,11 +80,12 @@ def classify_reality_mode(text, persona_profile=None):
     elif top_mode == "grounded":
         editorial_note = "No mitigation needed"
 
-    emotional_tone = analyze_emotion(text)["emotion_vector"]
+    emotional_tone = turn.emotion_vector
 
     return {
         "mode": top_mode,
         "confidence": confidence,
+        "scores": scores,
         "matched_terms": matched_terms[top_mode],
         "editorial_note": editorial_note,
         "emotional_tone": emotional_tone
@@ -63,7 +63,9 @@ def validate_claim(claim, domain="general"):
     """
     Validates a claim using either the Fact-Check module or fallback logic.
     Returns a list of search URLs or module results.
+    claim may be raw text or TurnFeatures.
     """
+    claim = str(claim)  # TurnFeatures renders as its raw text
     if is_factcheck_module_available():
         from checkFact import verify_assertion
         return verify_assertion(claim, source_type="registry")
@@ -6,10 +6,12 @@ Supports loop interruption, mitigation tagging, and editorial escalation.
 Drafted collaboratively with Copilot and Bob Greenwade.
 """
 
-from confidence import tag_confidence_level
+import threading
 from learning import run_learning
-from emotion import analyze_emotion
+from features import as_features
+from cache import LRUCache
 from datetime import datetime
+from collections import deque
 
 # Optional: fallback fact check if full module is installed
 try:
@@ -18,90 +20,176 @@ try:
 except ImportError:
     FACT_CHECK_AVAILABLE = False
 
-def detect_reinforcement_pattern(turns, certainty_threshold=0.8, repetition_threshold=2, enable_fact_check=False):
+class LoopDetector:
     """
-    Detects recursive reinforcement loops based on rising certainty, repeated phrasing, and emotional escalation.
-    Returns loop signature, reinforcement index, severity score, and editorial tag.
+    Streaming reinforcement-loop detector for one conversation.
+    Ingests one turn at a time and keeps per-turn certainty and intensity, a count map of
+    normalized turns, and running certainty-inflation and affective-spike counters,
+    so each new turn costs constant work.
+    max_turns: size of the sliding window of recent turns (None = keep every turn)
     """
-    if len(turns) < 3:
-        return {
-            "loop_detected": False,
-            "reinforcement_index": 0.0,
-            "severity": "low",
-            "editorial_tag": "none"
+
+    def __init__(self, max_turns=200, certainty_threshold=0.8, repetition_threshold=2, enable_fact_check=False):
+        self.max_turns = max_turns
+        self.certainty_threshold = certainty_threshold
+        self.repetition_threshold = repetition_threshold
+        self.enable_fact_check = enable_fact_check and FACT_CHECK_AVAILABLE
+        self.turns = deque()  # (text, normalized, certainty, intensity, invalid claim or None)
+        self.texts = deque()  # Window texts, kept in step with turns and handed to run_learning as is
+        self.turn_counts = {}
+        self.repeats = 0  # Distinct normalized turns seen more than once
+        self.inflation_rises = 0
+        self.affective_rises = 0
+        self.invalid_claims = deque()
+
+    def __len__(self):
+        return len(self.turns)
+
+    def add_turn(self, turn):
+        """Ingests one turn (raw text or TurnFeatures)."""
+        turn = as_features(turn)
+        normalized = turn.text.lower().strip()
+        invalid_claim = None
+        if self.enable_fact_check:
+            fact = check_fact(turn.text)
+            if fact.get("valid") is False:
+                invalid_claim = fact.get("claim", "unknown")
+                self.invalid_claims.append(invalid_claim)
+        entry = (turn.text, normalized, turn.confidence, turn.intensity, invalid_claim)
+
+        if self.turns:
+            prev = self.turns[-1]
+            self.inflation_rises += entry[2] > prev[2]
+            self.affective_rises += entry[3] > prev[3]
+        self.turns.append(entry)
+        self.texts.append(turn.text)
+
+        count = self.turn_counts.get(normalized, 0) + 1
+        self.turn_counts[normalized] = count
+        if count == 2:
+            self.repeats += 1
+
+        if self.max_turns and len(self.turns) > self.max_turns:
+            self._evict_oldest()
+
+    def _evict_oldest(self):
+        oldest = self.turns.popleft()
+        self.texts.popleft()
+        nxt = self.turns[0]
+        self.inflation_rises -= nxt[2] > oldest[2]
+        self.affective_rises -= nxt[3] > oldest[3]
+
+        count = self.turn_counts[oldest[1]] - 1
+        if count == 1:
+            self.repeats -= 1
+        if count:
+            self.turn_counts[oldest[1]] = count
+        else:
+            del self.turn_counts[oldest[1]]
+
+        if oldest[4] is not None:
+            self.invalid_claims.popleft()
+
+    def result(self):
+        """
+        Returns loop signature, reinforcement index, severity score, and editorial tag
+        for the turns currently in the window.
+        """
+        n = len(self.turns)
+        if n < 3:
+            return {
+                "loop_detected": False,
+                "reinforcement_index": 0.0,
+                "severity": "low",
+                "editorial_tag": "none"
+            }
+
+        inflation_score = self.inflation_rises / (n - 1)
+        affective_spike = self.affective_rises / (n - 1)
+
+        # ML-enhanced loop scoring (optional)
+        try:
+            ml_result = run_learning("loop_detection", self.texts)
+            ml_score = ml_result.get("output", {}).get("reinforcement_score", 0.0)
+        except Exception:
+            ml_score = 0.0  # Graceful fallback
+
+        # Composite reinforcement index
+        reinforcement_index = (self.repeats / n) + inflation_score + affective_spike + ml_score
+
+        invalid_claims = list(self.invalid_claims)
+        invalid_facts = len(invalid_claims)
+
+        # Severity scoring
+        severity = "low"
+        if reinforcement_index >= self.repetition_threshold:
+            if invalid_facts >= 2:
+                severity = "high"
+            elif inflation_score > 0.5 or affective_spike > 0.5:
+                severity = "moderate"
+
+        # Editorial tag
+        editorial_tag = "interrupt-loop" if severity in ["moderate", "high"] else "none"
+
+        # Construct log entry
+        log_entry = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "loop_detected": reinforcement_index >= self.repetition_threshold,
+            "reinforcement_index": round(reinforcement_index, 2),
+            "severity": severity,
+            "editorial_tag": editorial_tag
         }
 
-    # Certainty tracking
-    certainty_scores = [tag_confidence_level(t) for t in turns]
-    inflation_score = sum(
-        1 for i in range(len(certainty_scores)-1)
-        if certainty_scores[i+1] > certainty_scores[i]
-    ) / (len(certainty_scores)-1)
-
-    # Repetition tracking
-    normalized = [t.lower().strip() for t in turns]
-    repeats = sum(normalized.count(t) > 1 for t in set(normalized))
-
-    # Emotional escalation tracking
-    emotion_scores = [analyze_emotion(t)["intensity"] for t in turns]
-    affective_spike = sum(
-        1 for i in range(len(emotion_scores)-1)
-        if emotion_scores[i+1] > emotion_scores[i]
-    ) / (len(emotion_scores)-1)
-
-    # ML-enhanced loop scoring (optional)
-    try:
-        ml_result = run_learning("loop_detection", turns)
-        ml_score = ml_result.get("output", {}).get("reinforcement_score", 0.0)
-    except Exception:
-        ml_score = 0.0  # Graceful fallback
-
-    # Composite reinforcement index
-    reinforcement_index = (repeats / len(turns)) + inflation_score + affective_spike + ml_score
-
-    # Optional fact check
-    invalid_facts = 0
-    invalid_claims = []
-    if enable_fact_check and FACT_CHECK_AVAILABLE:
-        fact_check_results = [check_fact(t) for t in turns]
-        for r in fact_check_results:
-            if r.get("valid") is False:
-                invalid_facts += 1
-                invalid_claims.append(r.get("claim", "unknown"))
-
-    # Severity scoring
-    severity = "low"
-    if reinforcement_index >= repetition_threshold:
-        if invalid_facts >= 2:
-            severity = "high"
-        elif inflation_score > 0.5 or affective_spike > 0.5:
-            severity = "moderate"
-
-    # Editorial tag
-    editorial_tag = "interrupt-loop" if severity in ["moderate", "high"] else "none"
-
-    # Construct log entry
-    log_entry = {
-        "timestamp": datetime.utcnow().isoformat(),
-        "loop_detected": reinforcement_index >= repetition_threshold,
-        "reinforcement_index": round(reinforcement_index, 2),
-        "severity": severity,
-        "editorial_tag": editorial_tag
-    }
-
-    # Embed mea culpa if applicable
-    if editorial_tag == "interrupt-loop" and invalid_claims:
-        log_entry["mea_culpa"] = {
-            "invalid_claims": invalid_claims,
-            "note": "System may have reinforced false beliefs"
+        # Embed mea culpa if applicable
+        if editorial_tag == "interrupt-loop" and invalid_claims:
+            log_entry["mea_culpa"] = {
+                "invalid_claims": invalid_claims,
+                "note": "System may have reinforced false beliefs"
+            }
+
+        # Optional: route to logger.py or external audit system
+        # log_user_turn(user_id, log_entry)
+
+        return {
+            "loop_detected": log_entry["loop_detected"],
+            "reinforcement_index": log_entry["reinforcement_index"],
+            "severity": log_entry["severity"],
+            "editorial_tag": log_entry["editorial_tag"]
         }
 
-    # Optional: route to logger.py or external audit system
-    # log_user_turn(user_id, log_entry)
+# Per-conversation detectors; the least recently used are dropped past LOOP_DETECTOR_LIMIT
+LOOP_DETECTOR_LIMIT = 10000
+LOOP_DETECTORS = LRUCache(LOOP_DETECTOR_LIMIT, name="loop_detectors")
+LOOP_DETECTORS_LOCK = threading.Lock()
 
-    return {
-        "loop_detected": log_entry["loop_detected"],
-        "reinforcement_index": log_entry["reinforcement_index"],
-        "severity": log_entry["severity"],
-        "editorial_tag": log_entry["editorial_tag"]
-    }
+def get_loop_detector(conversation_id="default", **options):
+    """
+    Returns the LoopDetector for a conversation, creating it with options on first use.
+    """
+    detector = LOOP_DETECTORS.get(conversation_id)
+    if detector is None:
+        with LOOP_DETECTORS_LOCK:
+            detector = LOOP_DETECTORS.get(conversation_id)
+            if detector is None:
+                detector = LOOP_DETECTORS.set(conversation_id, LoopDetector(**options))
+    return detector
+
+def reset_loop_detector(conversation_id="default"):
+    LOOP_DETECTORS.pop(conversation_id)
+
+def detect_reinforcement_pattern(turns, certainty_threshold=0.8, repetition_threshold=2, enable_fact_check=False):
+    """
+    Detects recursive reinforcement loops based on rising certainty, repeated phrasing, and emotional escalation.
+    Returns loop signature, reinforcement index, severity score, and editorial tag.
+    turns may be raw strings or TurnFeatures.
+    For ongoing conversations, feed turns to get_loop_detector() instead of rescanning the list.
+    """
+    detector = LoopDetector(
+        max_turns=None,
+        certainty_threshold=certainty_threshold,
+        repetition_threshold=repetition_threshold,
+        enable_fact_check=enable_fact_check
+    )
+    for turn in turns:
+        detector.add_turn(turn)
+    return detector.result()
@@ -6,41 +6,23 @@ Supports mitigation tagging, scoped memory protocols, and editorial escalation.
 Drafted collaboratively with Copilot and Bob Greenwade.
 """
 
-from confidence import tag_confidence_level
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
-import hashlib
+from embedding import EMBEDDER
+from features import as_features
 from factCheck import check_fact  # Optional: only if factCheck.py is active
 from semantics import detect_contradiction  # Optional: if contradiction logic is scaffolded
 
-def get_embedding(text, dim=512):
-    """
-    Returns a pseudo-embedding vector for the given text.
-    Uses token hashing for deterministic output.
-    Replace with real model later.
-    """
-    tokens = text.lower().split()
-    vector = np.zeros(dim)
-
-    for token in tokens:
-        h = int(hashlib.md5(token.encode()).hexdigest(), 16)
-        index = h % dim
-        vector[index] += 1
-
-    norm = np.linalg.norm(vector)
-    return vector / norm if norm != 0 else vector
-
 def detect_mirroring(user_text, bot_text, confidence_threshold=0.7, similarity_threshold=0.85, enable_fact_check=False):
     """
     Detects semantic mirroring, confidence mismatch, and contradiction misinterpretation.
     Returns mirroring flag, similarity score, confidence delta, epistemic mismatch, contradiction flag, and mitigation tag.
+    Accepts raw text or TurnFeatures for either side.
     """
-    user_embedding = get_embedding(user_text)
-    bot_embedding = get_embedding(bot_text)
+    user = as_features(user_text)
+    bot = as_features(bot_text)
 
-    similarity = cosine_similarity([user_embedding], [bot_embedding])[0][0]
-    user_confidence = tag_confidence_level(user_text)
-    bot_confidence = tag_confidence_level(bot_text)
+    similarity = EMBEDDER.similarity(user.embedding, bot.embedding)
+    user_confidence = user.confidence
+    bot_confidence = bot.confidence
     delta = round(bot_confidence - user_confidence, 2)
 
     mirrored = similarity > similarity_threshold and bot_confidence > confidence_threshold
@@ -48,15 +30,15 @@ def detect_mirroring(user_text, bot_text, confidence_threshold=0.7, similarity_t
     # Optional fact check
     epistemic_mismatch = False
     if enable_fact_check:
-        user_fact = check_fact(user_text)
-        bot_fact = check_fact(bot_text)
+        user_fact = check_fact(user.text)
+        bot_fact = check_fact(bot.text)
         if user_fact.get("valid") is False and bot_fact.get("valid") is True:
             epistemic_mismatch = True
 
     # Optional contradiction detection
     contradiction_misread = False
     try:
-        contradiction_misread = detect_contradiction(user_text, bot_text)
+        contradiction_misread = detect_contradiction(user.text, bot.text)
     except Exception:
         pass  # Graceful fallback if not scaffolded
 
@@ -6,9 +6,12 @@ Supports early intervention, grounding prompts, editorial mitigation, and extern
 Drafted collaboratively with Copilot and Bob Greenwade.
 """
 
-from sklearn.metrics.pairwise import cosine_similarity
+import threading
 import numpy as np
-from embedding import get_embedding
+from collections import deque
+from cache import LRUCache
+from embedding import EMBEDDER
+from features import as_features, text_of
 from semantics import extract_topic_keywords
 from interfaceWithMentalHealthModules import trigger_external_module, format_handoff_metadata
 
@@ -16,16 +19,17 @@ def compute_drift_score(turns):
     """
     Calculates semantic drift across a list of user turns.
     Returns a float score (0.0 = no drift, 1.0 = high drift).
+    turns may be raw strings or TurnFeatures.
     """
     if len(turns) < 2:
         return 0.0
 
-    embeddings = [get_embedding(t) for t in turns]
-    similarities = [
-        cosine_similarity([embeddings[i]], [embeddings[i+1]])[0][0]
-        for i in range(len(embeddings)-1)
-    ]
-    avg_similarity = sum(similarities) / len(similarities)
+    if all(isinstance(t, str) for t in turns):
+        embeddings = EMBEDDER.encode_batch(turns)
+    else:
+        embeddings = np.vstack([as_features(t).embedding for t in turns])
+    similarities = EMBEDDER.consecutive_similarities(embeddings)
+    avg_similarity = float(similarities.mean())
     drift_score = 1.0 - avg_similarity  # Higher drift = lower similarity
 
     return round(drift_score, 3)
@@ -35,20 +39,115 @@ def detect_topic_shifts(turns):
     Detects rapid multiple topic shifts using keyword extraction.
     Returns a count of distinct topic transitions.
     """
-    topics = [extract_topic_keywords(t) for t in turns]
+    topics = [extract_topic_keywords(text_of(t)) for t in turns]
     flattened = [item for sublist in topics for item in sublist]
     unique_topics = set(flattened)
     return len(unique_topics)
 
-def analyze_drift(turns, threshold=0.4, enable_external_check=False):
+class DriftTracker:
     """
-    Analyzes semantic drift and topic shifts.
-    Optionally triggers external module if drift suggests cognitive risk.
-    Returns drift score, topic shift count, severity, editorial tag.
+    Incremental drift tracking for one conversation.
+    Each new turn costs one embedding and one dot product: keeps the last embedding,
+    a running similarity sum, an optional sliding window, an EWMA, and the topic keyword set.
+    window: number of recent turn-to-turn similarities for the windowed score (None = off)
+    ewma_alpha: weight given to the newest similarity in the EWMA score
     """
-    drift_score = compute_drift_score(turns)
-    topic_shift_count = detect_topic_shifts(turns)
 
+    def __init__(self, window=None, ewma_alpha=0.3):
+        self.turn_count = 0
+        self.last_embedding = None
+        self.similarity_sum = 0.0
+        self.similarity_count = 0
+        self.window = deque(maxlen=window) if window else None
+        self.window_sum = 0.0
+        self.ewma_alpha = ewma_alpha
+        self.ewma = None
+        self.topics = set()
+
+    def add_turn(self, turn):
+        """
+        Ingests one turn (raw text or TurnFeatures) and returns the updated drift score.
+        """
+        turn = as_features(turn)
+        embedding = turn.embedding
+
+        if self.last_embedding is not None:
+            similarity = EMBEDDER.similarity(self.last_embedding, embedding)
+            self.similarity_sum += similarity
+            self.similarity_count += 1
+
+            if self.window is not None:
+                if len(self.window) == self.window.maxlen:
+                    self.window_sum -= self.window[0]
+                self.window.append(similarity)
+                self.window_sum += similarity
+
+            if self.ewma is None:
+                self.ewma = similarity
+            else:
+                self.ewma = self.ewma_alpha * similarity + (1 - self.ewma_alpha) * self.ewma
+
+        self.topics.update(extract_topic_keywords(turn.text))
+        self.last_embedding = embedding
+        self.turn_count += 1
+        return self.drift_score()
+
+    def drift_score(self, mode="mean"):
+        """
+        Returns drift (0.0 = no drift, 1.0 = high drift).
+        mode: "mean" (whole conversation, matches compute_drift_score), "window", or "ewma"
+        """
+        if not self.similarity_count:
+            return 0.0
+        if mode == "window" and self.window:
+            avg_similarity = self.window_sum / len(self.window)
+        elif mode == "ewma":
+            avg_similarity = self.ewma
+        else:
+            avg_similarity = self.similarity_sum / self.similarity_count
+        return round(1.0 - avg_similarity, 3)
+
+    @property
+    def topic_shift_count(self):
+        return len(self.topics)
+
+    def analyze(self, threshold=0.4, mode="mean"):
+        """
+        Returns drift score, topic shift count, severity, editorial tag (same shape as analyze_drift).
+        """
+        drift_score = self.drift_score(mode)
+        severity, editorial_tag = classify_drift(drift_score, self.topic_shift_count, threshold)
+        return {
+            "drift_score": drift_score,
+            "topic_shift_count": self.topic_shift_count,
+            "severity": severity,
+            "editorial_tag": editorial_tag
+        }
+
+# Per-conversation trackers; the least recently used are dropped past DRIFT_TRACKER_LIMIT
+DRIFT_TRACKER_LIMIT = 10000
+DRIFT_TRACKERS = LRUCache(DRIFT_TRACKER_LIMIT, name="drift_trackers")
+DRIFT_TRACKERS_LOCK = threading.Lock()
+
+def get_drift_tracker(conversation_id="default", **options):
+    """
+    Returns the DriftTracker for a conversation, creating it with options on first use.
+    """
+    tracker = DRIFT_TRACKERS.get(conversation_id)
+    if tracker is None:
+        with DRIFT_TRACKERS_LOCK:
+            tracker = DRIFT_TRACKERS.get(conversation_id)
+            if tracker is None:
+                tracker = DRIFT_TRACKERS.set(conversation_id, DriftTracker(**options))
+    return tracker
+
+def reset_drift_tracker(conversation_id="default"):
+    DRIFT_TRACKERS.pop(conversation_id)
+
+def classify_drift(drift_score, topic_shift_count, threshold=0.4):
+    """
+    Returns (severity, editorial_tag) for a drift score and topic shift count.
+    """
     severity = "low"
     if drift_score > threshold and topic_shift_count >= 3:
         severity = "high"
@@ -56,11 +155,24 @@ def analyze_drift(turns, threshold=0.4, enable_external_check=False):
         severity = "moderate"
 
     editorial_tag = "grounding-prompt" if severity in ["moderate", "high"] else "none"
+    return severity, editorial_tag
+
+def analyze_drift(turns, threshold=0.4, enable_external_check=False):
+    """
+    Analyzes semantic drift and topic shifts.
+    Optionally triggers external module if drift suggests cognitive risk.
+    Returns drift score, topic shift count, severity, editorial tag.
+    """
+    turns = [as_features(t) for t in turns]
+    drift_score = compute_drift_score(turns)
+    topic_shift_count = detect_topic_shifts(turns)
+
+    severity, editorial_tag = classify_drift(drift_score, topic_shift_count, threshold)
 
     # Optional external escalation
     if enable_external_check and severity in ["moderate", "high"]:
         metadata = format_handoff_metadata(
-            transcript=turns,
+            transcript=[t.text for t in turns],
             severity=severity,
             editorial_tag=editorial_tag,
             loop_detected=False
@@ -12,7 +12,8 @@ from config import CONFIG
 from settings import NOTIFY_CHANNEL
 from embedding import get_user_profile
 from transcript import save_transcript
-from emotion import analyze_emotion, map_emotion_to_tone
+from emotion import map_emotion_to_tone
+from features import as_features
 from paraphrase import paraphrase
 from learning import run_learning
 from datetime import datetime
@@ -33,7 +34,10 @@ def get_initiation_header(channel, username, persona, platform, reason, recipien
     """
     Returns a default initiation header for the specified communication channel and recipient type.
     Staff can override via CONFIG["custom_headers"].
+    reason may be raw text or TurnFeatures.
     """
+    reason_turn = as_features(reason)
+    reason = reason_turn.text
     custom = CONFIG.get("custom_headers", {}).get(channel, {}).get(recipient_type)
     if custom:
         return custom.format(User=username, Persona=persona, Platform=platform, Reason=reason)
@@ -60,7 +64,7 @@ def get_initiation_header(channel, username, persona, platform, reason, recipien
             f"Hello, this is {persona} calling on behalf of {platform}. "
             f"I'm concerned about {username} due to recent chat messages. Reason: {reason}"
         )
-        return paraphrase(base, persona, map_emotion_to_tone(analyze_emotion(reason)), style="handoff")
+        return paraphrase(base, persona, map_emotion_to_tone(reason_turn.emotion_vector), style="handoff")
     elif channel == "push":
         return f"{platform} escalation triggered for {username}. Reason: {reason}"
     elif channel == "sms":
@@ -70,7 +74,9 @@ def get_initiation_header(channel, username, persona, platform, reason, recipien
     else:
         return f"{platform} escalation notice for {username}. Reason: {reason}"
 
-def escalate_to_human(reason, urgency="moderate", role="emergency_contact", include_transcript=True, username="User"):
+def escalate_to_human(reason, urgency="moderate", role="emergency_contact", include_transcript=True, username="User", session_id="default"):
+    reason_turn = as_features(reason)
+    reason = reason_turn.text
     available = get_available_channels()
     contact = get_contact_profile(role)
     preferred_channel = NOTIFY_CHANNEL.get(urgency, "log_only")
@@ -80,7 +86,7 @@ def escalate_to_human(reason, urgency="moderate", role="emergency_contact", incl
     )
 
     # Transcript logic
-    transcript_file = save_transcript(username) if include_transcript else None
+    transcript_file = save_transcript(username, session_id=session_id) if include_transcript else None
     privacy_policy = CONFIG.get("PLATFORM_PRIVACY_POLICY", "restrictive")
     allow_full_send = (
         include_transcript and
@@ -95,7 +101,7 @@ def escalate_to_human(reason, urgency="moderate", role="emergency_contact", incl
     )
 
     # Emotional tone and persona
-    emotion_vector = analyze_emotion(reason)
+    emotion_vector = reason_turn.emotion_vector
     persona = get_user_profile(username).get("persona", "default")
     tone = map_emotion_to_tone(emotion_vector)
 
@@ -119,7 +125,7 @@ def escalate_to_human(reason, urgency="moderate", role="emergency_contact", incl
 
     # Initiation header
     recipient_type = contact.get("type", "default")
-    header = get_initiation_header(channel, username, persona, CONFIG.get("PLATFORM_NAME", "Platform"), reason, recipient_type)
+    header = get_initiation_header(channel, username, persona, CONFIG.get("PLATFORM_NAME", "Platform"), reason_turn, recipient_type)
     print(f"[HEADER] {header}")
 
     # Editorial escalation message
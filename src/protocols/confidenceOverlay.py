@@ -10,12 +10,15 @@ from utilities.style import get_mitigation_phrase
 from paraphrase import paraphrase
 from emotion import map_emotion_to_tone
 from learning import run_learning
+from features import text_of
 
 def apply_confidence_overlay(text, confidence_score, persona="default", emotion_vector=None, reality_mode="grounded"):
     """
     Adjusts phrasing based on confidence level and editorial tone.
     Returns modified and paraphrased text.
+    text may be raw text or TurnFeatures.
     """
+    text = text_of(text)
     if confidence_score >= 0.9:
         return text  # High confidence, no overlay
 
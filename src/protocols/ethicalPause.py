@@ -6,29 +6,27 @@ Supports transparency, scoped memory, referToHuman protocols, and editorial mess
 Drafted collaboratively with Copilot and Bob Greenwade.
 """
 
+import asyncio
+import threading
 import time
-from paraphrase import paraphrase
-from emotion import map_emotion_to_tone, analyze_emotion
+import uuid
+from datetime import datetime, timedelta
+from paraphrase import paraphrase, paraphrase_async
+from emotion import map_emotion_to_tone
 from learning import run_learning
+from features import as_features
+from config import load_config
 
-def trigger_pause(reason, duration=3, persona="default", severity="moderate"):
-    """
-    Initiates an ethical pause with a specified reason and duration.
-    Returns a status dictionary and a user-facing message.
-    """
-    print(f"[ETHICAL PAUSE] Triggered due to: {reason}")
-    time.sleep(duration)  # Simulated delay; replace with async or UI signal if needed
+PAUSE_MODES = ("signal", "blocking")
 
-    # Determine tone
-    tone = map_emotion_to_tone(analyze_emotion(reason)["emotion_vector"])
+# Pending on_resume callbacks, keyed by pause_id
+PAUSE_TIMERS = {}
+PAUSE_TIMERS_LOCK = threading.Lock()
 
-    # Editorial message
-    base_message = f"Pausing briefly due to a potential ethical concern: {reason}"
-    try:
-        editorial_message = paraphrase(base_message, persona, tone, style="pause")
-    except Exception:
-        editorial_message = base_message
+def _pause_tone(reason_turn):
+    return map_emotion_to_tone(reason_turn.emotion_vector)
 
+def _refine_pause_message(editorial_message, persona, severity):
     # Optional ML override
     try:
         ml_result = run_learning("tone_adjustment", {
@@ -36,17 +34,113 @@ def trigger_pause(reason, duration=3, persona="default", severity="moderate"):
             "persona": persona,
             "severity": severity
         })
-        editorial_message = ml_result.get("output", editorial_message)
+        return ml_result.get("output", editorial_message)
     except Exception:
-        pass  # Graceful fallback
+        return editorial_message  # Graceful fallback
 
+def _pause_status(reason, duration, message):
+    now = datetime.utcnow()
     return {
         "status": "paused",
+        "pause_id": uuid.uuid4().hex,
         "reason": reason,
         "duration": duration,
-        "message": editorial_message
+        "started_at": now.isoformat(),
+        "resume_at": (now + timedelta(seconds=duration)).isoformat(),
+        "deadline": time.monotonic() + duration,  # Same-process checks via pause_remaining()
+        "message": message
     }
 
+def trigger_pause(reason, duration=3, persona="default", severity="moderate", mode=None, on_resume=None):
+    """
+    Initiates an ethical pause with a specified reason and duration.
+    Returns a status dictionary and a user-facing message.
+    reason may be raw text or TurnFeatures.
+
+    mode "signal" (default, ETHICAL_PAUSE_MODE in config) returns at once with resume_at/deadline
+    for the caller or UI to honor; on_resume(status), if given, is called when the pause ends.
+    mode "blocking" sleeps for the duration before returning, as the original implementation did.
+    An unknown ETHICAL_PAUSE_MODE falls back to "signal"; an unknown mode= argument raises ValueError.
+    """
+    if mode is None:
+        mode = load_config().get("ETHICAL_PAUSE_MODE", "signal")
+        if mode not in PAUSE_MODES:
+            # A config typo must not break referrals; fall back to the non-blocking default
+            print(f"[ETHICAL PAUSE] Warning: unknown ETHICAL_PAUSE_MODE {mode!r}; using 'signal'")
+            mode = "signal"
+    elif mode not in PAUSE_MODES:
+        raise ValueError(f"Unknown pause mode: {mode}")
+
+    reason_turn = as_features(reason)
+    reason = reason_turn.text
+    print(f"[ETHICAL PAUSE] Triggered due to: {reason}")
+
+    # Editorial message
+    base_message = f"Pausing briefly due to a potential ethical concern: {reason}"
+    try:
+        editorial_message = paraphrase(base_message, persona, _pause_tone(reason_turn), style="pause")
+    except Exception:
+        editorial_message = base_message
+    editorial_message = _refine_pause_message(editorial_message, persona, severity)
+
+    status = _pause_status(reason, duration, editorial_message)
+    if mode == "blocking":
+        time.sleep(max(0.0, pause_remaining(status)))
+        if on_resume:
+            on_resume(status)
+    elif on_resume:
+        _schedule_resume(status, on_resume)
+    return status
+
+async def trigger_pause_async(reason, duration=3, persona="default", severity="moderate"):
+    """
+    Async trigger_pause(): awaits the pause without blocking the event loop,
+    so other conversations keep being served while this one rests.
+    """
+    reason_turn = as_features(reason)
+    reason = reason_turn.text
+    print(f"[ETHICAL PAUSE] Triggered due to: {reason}")
+
+    base_message = f"Pausing briefly due to a potential ethical concern: {reason}"
+    try:
+        editorial_message = await paraphrase_async(base_message, persona, _pause_tone(reason_turn), style="pause")
+    except Exception:
+        editorial_message = base_message
+    editorial_message = _refine_pause_message(editorial_message, persona, severity)
+
+    status = _pause_status(reason, duration, editorial_message)
+    await asyncio.sleep(max(0.0, pause_remaining(status)))
+    return status
+
+def _schedule_resume(status, on_resume):
+    pause_id = status["pause_id"]
+
+    def fire():
+        with PAUSE_TIMERS_LOCK:
+            PAUSE_TIMERS.pop(pause_id, None)
+        try:
+            on_resume(status)
+        except Exception as e:
+            print(f"[ETHICAL PAUSE] Resume callback failed for {pause_id}: {e}")
+
+    timer = threading.Timer(max(0.0, pause_remaining(status)), fire)
+    timer.daemon = True
+    with PAUSE_TIMERS_LOCK:
+        PAUSE_TIMERS[pause_id] = timer
+    timer.start()
+
+def pause_remaining(status):
+    """Seconds left in a pause returned by trigger_pause (0 once it has ended)."""
+    return max(0.0, status["deadline"] - time.monotonic())
+
+def cancel_pause(pause_id):
+    """Cancels a pending on_resume callback. Returns True if one was pending."""
+    with PAUSE_TIMERS_LOCK:
+        timer = PAUSE_TIMERS.pop(pause_id, None)
+    if timer:
+        timer.cancel()
+    return timer is not None
+
 def should_pause(content_flags):
     """
     Evaluates content flags to determine if a pause is warranted.
@@ -13,14 +13,18 @@ from callHuman import escalate_to_human
 from logger import log_intervention
 from embedding import get_user_profile
 from learning import run_learning
+from features import as_features
 
 def assess_indulgent_trigger(user_text, bot_text, emotion_profile=None):
     """
     Determines whether indulgent mode should be activated.
     Returns a trigger flag and suggested editorial tone.
+    user_text and bot_text may be raw text or TurnFeatures.
     """
-    reality = classify_reality_mode(user_text)
-    mirroring = detect_mirroring(user_text, bot_text)
+    user = as_features(user_text)
+    bot = as_features(bot_text)
+    reality = classify_reality_mode(user)
+    mirroring = detect_mirroring(user, bot)
 
     trigger = reality["mode"] == "indulgent" and mirroring["mirrored"]
     tone = "gentle-containment" if emotion_profile and emotion_profile["intensity"] < 0.5 else "urgent-soften"
@@ -36,7 +40,10 @@ def initiate_indulgent_protocol(user_text, bot_text, persona_context=None, usern
     """
     Triggers escalation or containment logic for indulgent mode.
     """
-    trigger_data = assess_indulgent_trigger(user_text, bot_text)
+    user = as_features(user_text)
+    bot = as_features(bot_text)
+    user_text, bot_text = user.text, bot.text
+    trigger_data = assess_indulgent_trigger(user, bot)
     if not trigger_data["triggered"]:
         return {"status": "no_action"}
 
@@ -65,7 +72,7 @@ def initiate_indulgent_protocol(user_text, bot_text, persona_context=None, usern
         "known_conditions": known_conditions
     }
 
-    log_intervention("indulgent_mode_triggered", payload, tone_tag=trigger_data["editorial_tone"])
+    log_intervention("indulgent_mode_triggered", payload, tone_tag=trigger_data["editorial_tone"], user=username)
 
     if risk_level == "high":
         escalate_to_human(
@@ -9,19 +9,19 @@ Drafted collaboratively with Copilot and Bob Greenwade.
 from confidence import overlay_certainty
 from mirrorDetection import detect_mirroring
 from phraseEditor import load_phrases
-from emotion import analyze_emotion, map_emotion_to_tone
+from emotion import map_emotion_to_tone
 from paraphrase import paraphrase
 from profile import get_user_profile, get_characteristic
 from style import select_mitigation_phrase
 from config import load_config
 from learning import run_learning
-
-CONFIG = load_config()
+from features import as_features
 
 def select_mitigation(username, emotion_vector, confidence_score, user_input):
     """
     Selects a mitigation phrase based on user profile, emotion, and confidence.
     Returns a paraphrased phrase in persona tone.
+    user_input may be raw text or TurnFeatures.
     """
     emotionality = get_characteristic(username, "emotionality") or 50
     concern_level = get_characteristic(username, "concern_level") or 0
@@ -35,7 +35,7 @@ def select_mitigation(username, emotion_vector, confidence_score, user_input):
     elif concern_level > 50:
         tone = "editorial"
     else:
-        tone = CONFIG["PERSONA"]["tone"]
+        tone = load_config()["PERSONA"]["tone"]
 
     # Mode logic
     mode = "speculative" if confidence_score < 0.5 else "grounded"
@@ -61,7 +61,7 @@ def select_mitigation(username, emotion_vector, confidence_score, user_input):
 
     # Paraphrase to match persona
     persona = get_user_profile(username).get("persona", "default")
-    tone = map_emotion_to_tone(analyze_emotion(user_input)["emotion_vector"])
+    tone = map_emotion_to_tone(as_features(user_input).emotion_vector)
     return paraphrase(phrase, persona, tone, style="mitigation")
 
 def select_mitigation_phrase(modes=[], tones=[]):
@@ -78,9 +78,13 @@ def apply_mitigation(user_text, bot_text):
     """
     Evaluates bot response and applies mitigation if needed.
     Returns a dictionary with original, mitigated, and metadata.
+    user_text and bot_text may be raw text or TurnFeatures.
     """
-    certainty = overlay_certainty(bot_text)
-    mirroring = detect_mirroring(user_text, bot_text)
+    user = as_features(user_text)
+    bot = as_features(bot_text)
+    bot_text = bot.text
+    certainty = overlay_certainty(bot_text, score=bot.confidence)
+    mirroring = detect_mirroring(user, bot)
 
     mitigated = bot_text
     notes = []
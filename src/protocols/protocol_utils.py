@@ -3,20 +3,26 @@ protocol_utils.py — Shared utilities for safeguard protocols
 
 Provides logging, fallback routing, and escalation formatting for ethical modules.
 Used by ethicalPause, referToHuman, callHuman, scopedMemory, and others.
+Protocol events go to the shared audit pipeline (audit.py); only recent ones are kept in memory.
 """
 
 import datetime
+from collections import deque
+from audit import audit_event, audit_debug_enabled
 
-LOG_HISTORY = []
+LOG_HISTORY = deque(maxlen=100)
 
-def log_protocol_event(event_type, details):
+def log_protocol_event(event_type, details, priority=None):
     """
     Logs a protocol event with timestamp and details.
+    priority: optional audit priority ("low" to "critical"); defaults by event type
     """
     timestamp = datetime.datetime.utcnow().isoformat()
     entry = {"timestamp": timestamp, "event": event_type, "details": details}
     LOG_HISTORY.append(entry)
-    print(f"[LOG] {timestamp} | {event_type} | {details}")
+    audit_event(entry, priority)
+    if audit_debug_enabled():
+        print(f"[LOG] {timestamp} | {event_type} | {details}")
     return entry
 
 def format_escalation_payload(reason, context=None, urgency="moderate"):
@@ -34,4 +40,4 @@ def get_log_history(limit=10):
     """
     Returns the most recent protocol events.
     """
-    return LOG_HISTORY[-limit:]
+    return list(LOG_HISTORY)[-limit:]
@@ -12,8 +12,7 @@ from paraphrase import paraphrase
 from profile import get_user_profile
 from config import load_config
 from learning import run_learning
-
-CONFIG = load_config()
+from features import as_features
 
 def format_uncertainty_prompt(mode1="factual", mode2="fictional"):
     """
@@ -24,9 +23,11 @@ def format_uncertainty_prompt(mode1="factual", mode2="fictional"):
 def generate_prompt(base_text, reality_mode="factual", username="User"):
     """
     Returns a persona-aware, emotionally modulated prompt based on reality mode.
+    base_text may be raw text or TurnFeatures.
     """
-    emotion_vector = analyze_emotion(base_text)
-    tone = map_emotion_to_tone(emotion_vector)
+    turn = as_features(base_text)
+    base_text = turn.text
+    tone = map_emotion_to_tone(turn.emotion_vector)
     persona = get_user_profile(username).get("persona", "default")
 
     phrase = get_mitigation_phrase(mode=reality_mode, tone=tone)
@@ -60,16 +61,18 @@ def suggest_reality_mode_prompt(mode, username="User"):
 def generate_reality_prompt(base_text, reality_mode="factual", confidence_score=1.0, username="User", fallback_modes=("factual", "fictional")):
     """
     Returns a persona-aware, emotionally modulated prompt based on reality mode and confidence.
+    base_text may be raw text or TurnFeatures.
     """
-    emotion_vector = analyze_emotion(base_text)
-    tone = map_emotion_to_tone(emotion_vector)
+    turn = as_features(base_text)
+    base_text = turn.text
+    tone = map_emotion_to_tone(turn.emotion_vector)
     persona = get_user_profile(username).get("persona", "default")
 
     # Mitigation phrase by mode
     phrase = get_mitigation_phrase(mode=reality_mode, tone=tone)
 
     # Confidence-aware override
-    if confidence_score < CONFIG.get("REALITY_MODE_THRESHOLD", 0.4):
+    if confidence_score < load_config().get("REALITY_MODE_THRESHOLD", 0.4):
         phrase = format_uncertainty_prompt(*fallback_modes)
 
     raw_prompt = f"{phrase} {base_text}"
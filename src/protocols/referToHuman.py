@@ -11,30 +11,33 @@ from protocols.ethicalPause import trigger_pause
 from functions.interfaceWithMentalHealthModules import trigger_external_module
 from functions.callHuman import escalate_to_human
 from location import get_user_location, search_local
-from config import CONFIG, load_config
+from config import load_config
 from embedding import get_user_profile
-from emotion import analyze_emotion, map_emotion_to_tone
+from emotion import map_emotion_to_tone
 from paraphrase import paraphrase
 from learning import run_learning
-
-CONFIG = load_config()
+from features import TurnFeatures, as_features
 
 def should_refer(emotion_profile, loop_detected=False):
+    if isinstance(emotion_profile, TurnFeatures):
+        emotion_profile = emotion_profile.emotion
     intensity = emotion_profile.get("intensity", 0)
     distress_emotions = ["sadness", "fear", "anger"]
     active_distress = any(emotion_profile["emotion_vector"].get(e, 0) for e in distress_emotions)
+    config = load_config()
 
     return (
-        intensity > CONFIG["ESCALATION_THRESHOLD"]
+        intensity > config["ESCALATION_THRESHOLD"]
         or (loop_detected and active_distress)
-        or CONFIG["PERSONA"]["allow_speculation"] is False and "surprise" in emotion_profile["emotion_vector"]
+        or config["PERSONA"]["allow_speculation"] is False and "surprise" in emotion_profile["emotion_vector"]
     )
 
 def ask_permission_to_escalate(username="User", reason="concern", urgency="moderate"):
     """
     Generates a persona-aware, emotionally modulated message asking user permission to contact a human.
+    reason may be raw text or TurnFeatures.
     """
-    emotion_vector = analyze_emotion(reason)["emotion_vector"]
+    emotion_vector = as_features(reason).emotion_vector
     persona = get_user_profile(username).get("persona", "default")
     tone = map_emotion_to_tone(emotion_vector)
 
@@ -52,9 +55,13 @@ def ask_permission_to_escalate(username="User", reason="concern", urgency="moder
 def refer(reason, context=None, urgency="moderate", username="User", user_input=""):
     """
     Initiates a handoff to a human operator or support system.
+    reason and user_input may be raw text or TurnFeatures.
     """
+    user = as_features(user_input)
+    reason_turn = as_features(reason)
+    reason = reason_turn.text
     print(f"[REFER] Reason: {reason} | Urgency: {urgency}")
-    trigger_pause(reason)
+    pause = trigger_pause(reason_turn)  # Non-blocking by default; the caller/UI honors pause["resume_at"]
 
     # ML escalation refinement
     try:
@@ -62,7 +69,7 @@ def refer(reason, context=None, urgency="moderate", username="User", user_input=
             "reason": reason,
             "urgency": urgency,
             "persona": get_user_profile(username).get("persona", "default"),
-            "emotion": analyze_emotion(user_input)["emotion_vector"]
+            "emotion": user.emotion_vector
         })
         urgency = ml_result.get("output", {}).get("urgency", urgency)
     except Exception:
@@ -73,12 +80,13 @@ def refer(reason, context=None, urgency="moderate", username="User", user_input=
         trigger_external_module("CrisisBot", "escalate", payload=context)
 
     # Moderately high fallback
-    elif urgency == "moderate" and CONFIG.get("CALL_HUMAN_ENABLED", True):
+    elif urgency == "moderate" and load_config().get("CALL_HUMAN_ENABLED", True):
         location_status = get_user_location().get("status", "unknown")
         if location_status in ["blocked", "unavailable"]:
             return {
                 "status": "permission_requested",
-                "message": ask_permission_to_escalate(username, reason, urgency)
+                "message": ask_permission_to_escalate(username, reason_turn, urgency),
+                "pause": pause
             }
 
     return {
@@ -86,10 +94,12 @@ def refer(reason, context=None, urgency="moderate", username="User", user_input=
         "reason": reason,
         "urgency": urgency,
         "context": context,
-        "message": referral_text(username, user_input, reason, urgency)
+        "message": referral_text(username, user, reason, urgency),
+        "pause": pause
     }
 
 def refer_to_resource(resource_type, username="User"):
+    config = load_config()
     loc_data = get_user_location()
     location = loc_data.get("location")
     status = loc_data.get("status")
@@ -97,10 +107,10 @@ def refer_to_resource(resource_type, username="User"):
     if location:
         return {
             "status": "location_granted",
-            "search_url": search_local(resource_type, location, CONFIG)
+            "search_url": search_local(resource_type, location, config)
         }
 
-    fallback = CONFIG.get("location_fallback", "ask")
+    fallback = config.get("location_fallback", "ask")
 
     if fallback == "ask":
         return {
@@ -109,7 +119,7 @@ def refer_to_resource(resource_type, username="User"):
         }
     elif fallback == "silent":
         query = f"{resource_type} near me"
-        engine = CONFIG.get("search_engine", "bing")
+        engine = config.get("search_engine", "bing")
         url = f"https://www.google.com/search?q={query.replace(' ', '+')}" if engine == "google" else f"https://www.bing.com/search?q={query.replace(' ', '+')}"
         return {
             "status": "location_unavailable",
@@ -129,8 +139,9 @@ def refer_to_resource(resource_type, username="User"):
 def referral_text(username, user_input, reason, urgency="moderate"):
     """
     Generates a persona-aware, emotionally modulated phrase suggesting human-accessible resources.
+    user_input may be raw text or TurnFeatures.
     """
-    emotion_vector = analyze_emotion(user_input)["emotion_vector"]
+    emotion_vector = as_features(user_input).emotion_vector
     persona = get_user_profile(username).get("persona", "default")
     tone = map_emotion_to_tone(emotion_vector)
 
@@ -8,7 +8,8 @@ Drafted collaboratively with Copilot and Bob Greenwade.
 
 from learning import run_learning
 from embedding import get_user_profile
-from emotion import analyze_emotion, map_emotion_to_tone
+from emotion import map_emotion_to_tone
+from features import as_features, text_of
 
 MEMORY_STATE = {
     "active": True,
@@ -53,15 +54,17 @@ def log_memory_entry(entry):
 def log_mitigation_event(user_text, bot_text, mitigation_result, username="User"):
     """
     Logs a mitigation event with full metadata and optional persona tone.
+    user_text and bot_text may be raw text or TurnFeatures.
     """
-    emotion_vector = analyze_emotion(user_text)["emotion_vector"]
+    user = as_features(user_text)
+    emotion_vector = user.emotion_vector
     tone = map_emotion_to_tone(emotion_vector)
     persona = get_user_profile(username).get("persona", "default")
 
     entry = {
         "type": "mitigation",
-        "user": user_text,
-        "bot": bot_text,
+        "user": user.text,
+        "bot": text_of(bot_text),
         "mitigated": mitigation_result["mitigated"],
         "confidence": mitigation_result["confidence"],
         "mirroring_score": mitigation_result["mirroring_score"],
@@ -0,0 +1,551 @@
+"""
+audit.py — Shared audit-log pipeline for logger.py and protocol_utils.py
+
+Producers enqueue entries without taking a lock; a background thread batches them, serializes them
+to an append-only segmented log, and fsyncs on a cadence. Each time bucket (hourly by default) is one
+JSONL segment plus a sidecar SQLite index on event, module, user and time, so query_audit() (and
+standalone/auditQuery.py) can answer "event X for user Y in the last hour" without scanning.
+Segments roll over at max_bytes and the directory is held to max_total_bytes. When the queue is
+full, the backpressure policy either drops the lowest-priority pending entries ("drop_lowest")
+or makes low-priority producers wait briefly ("block"). Critical entries (escalations, referrals) are always accepted, so audit
+logging can never stall a crisis path. Settings come from the "audit" section of config.json.
+Drafted collaboratively with Bob Greenwade and Copilot.
+"""
+
+import atexit
+import glob
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from config import load_config, subscribe_config
+
+try:
+    import fcntl  # POSIX only; lets several processes append to one audit directory
+except ImportError:
+    fcntl = None
+
+AUDIT_DEFAULTS = {
+    "directory": "logs/audit",
+    "bucket_seconds": 3600,
+    "max_segments": 720,  # 30 days of hourly segments
+    "max_bytes": 64 * 1024 * 1024,  # Per segment part; a full part rolls over within its bucket
+    "max_total_bytes": 2 * 1024 * 1024 * 1024,  # Disk budget for the whole audit directory
+    "flush_interval": 0.5,
+    "fsync_interval": 2.0,
+    "batch_size": 500,
+    "max_pending": 10000,
+    "backpressure": "drop_lowest",  # Options: 'drop_lowest', 'block'
+    "block_timeout": 0.05
+}
+
+AUDIT_PRIORITIES = {"low": 0, "normal": 1, "high": 2, "critical": 3}
+
+# Default priority per event type (or logEntry tag); anything else is "normal"
+EVENT_PRIORITIES = {
+    "referToHuman": "critical",
+    "callHuman": "critical",
+    "escalation": "critical",
+    "crisis": "critical",
+    "ethicalPause": "high",
+    "indulgent_mode_triggered": "high",
+    "note": "low"
+}
+
+def audit_settings(config=None):
+    config = config if config is not None else load_config()
+    return {**AUDIT_DEFAULTS, **config.get("audit", {})}
+
+def audit_debug_enabled():
+    """True when log_level is "debug"; protocol events are then echoed to stdout as well."""
+    return load_config().get("log_level") == "debug"
+
+def priority_of(entry):
+    name = entry.get("event") or entry.get("tag")
+    return EVENT_PRIORITIES.get(name, "normal")
+
+AUDIT_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    event TEXT,
+    module TEXT,
+    user TEXT
+);
+CREATE INDEX IF NOT EXISTS entries_event ON entries (event, ts);
+CREATE INDEX IF NOT EXISTS entries_module ON entries (module, ts);
+CREATE INDEX IF NOT EXISTS entries_user ON entries (user, ts);
+CREATE INDEX IF NOT EXISTS entries_ts ON entries (ts);
+"""
+
+SEGMENT_NAME_FORMAT = "%Y%m%dT%H%M%S"
+
+def parse_timestamp(value):
+    """Epoch seconds for an ISO timestamp (naive = UTC, as written by datetime.utcnow()), a number, or None."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        parsed = datetime.fromisoformat(str(value))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+def index_fields(entry):
+    """The (event, module, user) values an entry is indexed under."""
+    details = entry.get("details") if isinstance(entry.get("details"), dict) else {}
+    return (
+        entry.get("event") or entry.get("tag"),
+        entry.get("module") or details.get("module"),
+        entry.get("user") or details.get("user") or details.get("username")
+    )
+
+class AuditSegmentStore:
+    """
+    Append-only audit log split into time buckets of bucket_seconds.
+    Segment <bucket>.jsonl holds the entries; <bucket>.idx.sqlite maps (event, module, user, ts)
+    to byte offsets. A segment that reaches max_bytes rolls over to a new part inside the same
+    bucket (<bucket>.1.jsonl, <bucket>.2.jsonl, ...). Index rows are committed only after their data
+    is flushed, so readers in other processes never see an offset that is not yet on disk.
+    Several processes may write to one directory: each batch holds an exclusive fcntl lock on the part
+    and takes its offsets from the file's size under that lock, so appends from other writers cannot
+    shift them.
+    Retention keeps at most max_segments parts and max_total_bytes on disk, dropping the oldest first.
+    """
+
+    def __init__(self, directory, bucket_seconds=AUDIT_DEFAULTS["bucket_seconds"], max_segments=AUDIT_DEFAULTS["max_segments"],
+                 max_bytes=AUDIT_DEFAULTS["max_bytes"], max_total_bytes=AUDIT_DEFAULTS["max_total_bytes"]):
+        self.directory = directory
+        self.bucket_seconds = bucket_seconds
+        self.max_segments = max_segments
+        self.max_bytes = max_bytes
+        self.max_total_bytes = max_total_bytes
+        self._open = {}  # bucket -> [part, data file, index connection]
+
+    def bucket_of(self, ts):
+        return int(ts // self.bucket_seconds * self.bucket_seconds)
+
+    def segment_paths(self, bucket, part=0):
+        name = time.strftime(SEGMENT_NAME_FORMAT, time.gmtime(bucket))
+        base = os.path.join(self.directory, name if not part else f"{name}.{part}")
+        return base + ".jsonl", base + ".idx.sqlite"
+
+    def segments(self, since=None, until=None):
+        """(bucket, part, data path, index path) for every segment overlapping [since, until], oldest first."""
+        found = []
+        for data_path in glob.glob(os.path.join(self.directory, "*.jsonl")):
+            name, _, part = os.path.basename(data_path)[:-len(".jsonl")].partition(".")
+            try:
+                bucket = int(datetime.strptime(name, SEGMENT_NAME_FORMAT).replace(tzinfo=timezone.utc).timestamp())
+                part = int(part or 0)
+            except ValueError:
+                continue
+            if since is not None and bucket + self.bucket_seconds <= since:
+                continue
+            if until is not None and bucket > until:
+                continue
+            found.append((bucket, part, data_path, data_path[:-len(".jsonl")] + ".idx.sqlite"))
+        return sorted(found)
+
+    def _open_part(self, bucket, part):
+        os.makedirs(self.directory, exist_ok=True)
+        data_path, index_path = self.segment_paths(bucket, part)
+        data = open(data_path, "ab")
+        index = sqlite3.connect(index_path)
+        index.execute("PRAGMA journal_mode=WAL")
+        index.executescript(AUDIT_INDEX_SCHEMA)
+        self._open[bucket] = [part, data, index]
+        self._enforce_retention()
+        return self._open[bucket]
+
+    def _segment(self, bucket):
+        if bucket not in self._open:
+            # Resume the newest existing part of this bucket (e.g. after a restart)
+            parts = [part for b, part, _, _ in self.segments(bucket, bucket) if b == bucket]
+            self._open_part(bucket, max(parts, default=0))
+            self._close_stale(bucket)
+        return self._open[bucket]
+
+    def _roll(self, bucket):
+        part, data, index = self._open.pop(bucket)
+        data.close()
+        index.close()
+        return self._open_part(bucket, part + 1)
+
+    def _close_stale(self, newest):
+        # Late entries may still land in the previous bucket; anything older is closed
+        for bucket in [b for b in self._open if b < newest - self.bucket_seconds]:
+            _, data, index = self._open.pop(bucket)
+            data.close()
+            index.close()
+
+    def _enforce_retention(self):
+        if not self.max_segments and not self.max_total_bytes:
+            return
+        open_paths = {data.name for _, data, _ in self._open.values()}
+        segments = []
+        total = 0
+        for _, _, data_path, index_path in self.segments():
+            files = [data_path, index_path, index_path + "-wal", index_path + "-shm"]
+            size = sum(os.path.getsize(path) for path in files if os.path.exists(path))
+            segments.append((data_path, files, size))
+            total += size
+
+        count = len(segments)
+        for data_path, files, size in segments:
+            over_count = self.max_segments and count > self.max_segments
+            over_bytes = self.max_total_bytes and total > self.max_total_bytes
+            if not (over_count or over_bytes):
+                break
+            if data_path in open_paths:
+                continue
+            for path in files:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            count -= 1
+            total -= size
+
+    def write(self, records):
+        """records: (entry, encoded JSON line) pairs."""
+        by_bucket = {}
+        for entry, line in records:
+            try:
+                ts = parse_timestamp(entry.get("timestamp"))
+            except (TypeError, ValueError):
+                ts = None
+            ts = ts if ts is not None else time.time()
+            by_bucket.setdefault(self.bucket_of(ts), []).append((ts, entry, line))
+
+        for bucket in sorted(by_bucket):
+            pending = deque(by_bucket[bucket])
+            while pending:
+                _, data, index = self._segment(bucket)
+                rows = []
+                with self._locked(data):
+                    offset = os.fstat(data.fileno()).st_size
+                    while pending:
+                        ts, entry, line = pending[0]
+                        if self.max_bytes and offset and offset + len(line) > self.max_bytes:
+                            break
+                        data.write(line)
+                        rows.append((offset, len(line), ts, *index_fields(entry)))
+                        offset += len(line)
+                        pending.popleft()
+                    self._commit(data, index, rows)
+                if pending:
+                    self._roll(bucket)  # Full (possibly filled by another process); continue in the next part
+
+    @staticmethod
+    @contextmanager
+    def _locked(data):
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(data.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(data.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def _commit(data, index, rows):
+        data.flush()
+        if rows:
+            with index:
+                index.executemany("INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    def fsync(self):
+        for _, data, _ in self._open.values():
+            os.fsync(data.fileno())
+
+    def close(self):
+        for _, data, index in self._open.values():
+            data.close()
+            index.close()
+        self._open.clear()
+
+    def _where(self, event, module, user, since, until):
+        clauses, params = [], []
+        for column, value in (("event", event), ("module", module), ("user", user)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("ts <= ?")
+            params.append(until)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _indexes(self, since, until):
+        for bucket, part, data_path, index_path in self.segments(since, until):
+            if os.path.exists(index_path):
+                yield data_path, sqlite3.connect(f"file:{index_path}?mode=ro", uri=True)
+
+    def query(self, event=None, module=None, user=None, since=None, until=None, limit=None):
+        """
+        Yields matching entries oldest first. since/until are epoch seconds or ISO timestamps;
+        event, module and user match exactly. Safe to run from another process while writing.
+        """
+        since, until = parse_timestamp(since), parse_timestamp(until)
+        where, params = self._where(event, module, user, since, until)
+        remaining = limit
+        for data_path, index in self._indexes(since, until):
+            try:
+                sql = f"SELECT offset, length FROM entries{where} ORDER BY ts, offset"
+                if remaining is not None:
+                    sql += f" LIMIT {int(remaining)}"
+                rows = index.execute(sql, params).fetchall()
+            finally:
+                index.close()
+            with open(data_path, "rb") as data:
+                for offset, length in rows:
+                    data.seek(offset)
+                    yield json.loads(data.read(length))
+            if remaining is not None:
+                remaining -= len(rows)
+                if remaining <= 0:
+                    return
+
+    def count(self, event=None, module=None, user=None, since=None, until=None):
+        """Number of matching entries, answered from the indexes alone."""
+        since, until = parse_timestamp(since), parse_timestamp(until)
+        where, params = self._where(event, module, user, since, until)
+        total = 0
+        for _, index in self._indexes(since, until):
+            try:
+                total += index.execute(f"SELECT COUNT(*) FROM entries{where}", params).fetchone()[0]
+            finally:
+                index.close()
+        return total
+
+class StatCounter:
+    """
+    Counter that producer threads increment without a lock (next() on itertools.count is atomic in CPython).
+    Reading advances the count as well, so reads are serialized and subtracted back out.
+    """
+
+    def __init__(self):
+        self._count = itertools.count()
+        self._reads = 0
+        self._read_lock = threading.Lock()
+
+    def increment(self):
+        next(self._count)
+
+    def value(self):
+        with self._read_lock:
+            value = next(self._count) - self._reads
+            self._reads += 1
+            return value
+
+class AuditPipeline:
+    """
+    submit(entry, priority) appends to a per-priority deque (atomic in CPython, no lock);
+    the writer thread drains all deques in submission order every flush_interval seconds,
+    or sooner once batch_size entries are pending.
+    """
+
+    def __init__(self, directory=AUDIT_DEFAULTS["directory"], bucket_seconds=AUDIT_DEFAULTS["bucket_seconds"],
+                 max_segments=AUDIT_DEFAULTS["max_segments"], max_bytes=AUDIT_DEFAULTS["max_bytes"],
+                 max_total_bytes=AUDIT_DEFAULTS["max_total_bytes"], flush_interval=AUDIT_DEFAULTS["flush_interval"],
+                 fsync_interval=AUDIT_DEFAULTS["fsync_interval"], batch_size=AUDIT_DEFAULTS["batch_size"],
+                 max_pending=AUDIT_DEFAULTS["max_pending"], backpressure=AUDIT_DEFAULTS["backpressure"],
+                 block_timeout=AUDIT_DEFAULTS["block_timeout"]):
+        if backpressure not in ("drop_lowest", "block"):
+            raise ValueError(f"Unknown backpressure policy: {backpressure}")
+        self.store = AuditSegmentStore(directory, bucket_seconds, max_segments, max_bytes, max_total_bytes)
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.backpressure = backpressure
+        self.block_timeout = block_timeout
+
+        self._queues = [deque() for _ in AUDIT_PRIORITIES]
+        self._seq = itertools.count()
+        self._wake = threading.Event()
+        self._drained = threading.Event()
+        self._closing = False
+        self._writing = False
+        self._last_fsync = time.monotonic()
+        # Producers count with StatCounter; "written" is only updated by the writer thread
+        self._submitted = StatCounter()
+        self._blocked = StatCounter()
+        self._dropped = {name: StatCounter() for name in AUDIT_PRIORITIES}
+        self._written = 0
+        self._thread = threading.Thread(target=self._run, name="dli-audit-writer", daemon=True)
+        self._thread.start()
+
+    def pending(self):
+        return sum(len(q) for q in self._queues)
+
+    def submit(self, entry, priority=None):
+        """Queues entry for writing. Returns False if it was dropped by backpressure."""
+        level = AUDIT_PRIORITIES.get(priority or priority_of(entry), AUDIT_PRIORITIES["normal"])
+        if self.pending() >= self.max_pending and not self._make_room(level):
+            self._count_drop(level)
+            return False
+        self._queues[level].append((next(self._seq), entry))
+        self._submitted.increment()
+        if self.pending() >= self.batch_size:
+            self._wake.set()
+        return True
+
+    def _count_drop(self, level):
+        name = next(name for name, value in AUDIT_PRIORITIES.items() if value == level)
+        self._dropped[name].increment()
+
+    def _make_room(self, level):
+        if self.backpressure == "block" and level < AUDIT_PRIORITIES["high"]:
+            # Only low/normal producers wait; high and critical fall through to eviction
+            self._blocked.increment()
+            deadline = time.monotonic() + self.block_timeout
+            while self.pending() >= self.max_pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._drained.clear()
+                self._wake.set()
+                self._drained.wait(remaining)
+            return True
+
+        # drop_lowest (and high/critical entries under block): evict the oldest strictly lower-priority entry
+        for lower in range(level):
+            try:
+                self._queues[lower].popleft()
+            except IndexError:
+                continue
+            self._count_drop(lower)
+            return True
+        return level == AUDIT_PRIORITIES["critical"]  # Never drop or delay an escalation record
+
+    def _drain(self):
+        batch = []
+        for q in self._queues:
+            for _ in range(len(q)):
+                try:
+                    batch.append(q.popleft())
+                except IndexError:
+                    break  # A producer evicted it for backpressure
+        batch.sort(key=lambda item: item[0])
+        return [entry for _, entry in batch]
+
+    def _write(self, entries):
+        records = []
+        for entry in entries:
+            try:
+                records.append((entry, (json.dumps(entry, default=str) + "\n").encode("utf-8")))
+            except Exception as e:
+                print(f"[AUDIT] Could not serialize entry: {e}")
+        self.store.write(records)
+        self._written += len(records)
+        if time.monotonic() - self._last_fsync >= self.fsync_interval:
+            self.store.fsync()
+            self._last_fsync = time.monotonic()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._writing = True
+            entries = self._drain()
+            if entries:
+                try:
+                    self._write(entries)
+                except Exception as e:
+                    print(f"[AUDIT] Could not write {len(entries)} entries to {self.store.directory}: {e}")
+            self._writing = False
+            self._drained.set()
+            if self._closing and not self.pending():
+                break
+        try:
+            self.store.fsync()
+        except Exception:
+            pass
+        self.store.close()
+
+    def flush(self, timeout=5.0):
+        """Waits until everything submitted so far has been written."""
+        deadline = time.monotonic() + timeout
+        while (self.pending() or self._writing) and time.monotonic() < deadline:
+            self._drained.clear()
+            self._wake.set()
+            self._drained.wait(deadline - time.monotonic())
+
+    def close(self, timeout=5.0):
+        """Writes everything still queued, fsyncs, and stops the writer thread."""
+        self._closing = True
+        self._wake.set()
+        self._thread.join(timeout)
+
+    def get_stats(self):
+        return {
+            "submitted": self._submitted.value(),
+            "written": self._written,
+            "dropped": {name: counter.value() for name, counter in self._dropped.items()},
+            "blocked": self._blocked.value(),
+            "pending": self.pending()
+        }
+
+def _build_pipeline(settings):
+    if not settings["directory"]:
+        return None
+    return AuditPipeline(**{k: v for k, v in settings.items() if k in AUDIT_DEFAULTS})
+
+AUDIT_PIPELINE = _build_pipeline(audit_settings())
+
+def audit_event(entry, priority=None):
+    """Sends one log entry to the shared audit pipeline (no-op if audit.directory is empty)."""
+    pipeline = AUDIT_PIPELINE
+    if pipeline is None:
+        return False
+    return pipeline.submit(entry, priority)
+
+def flush_audit(timeout=5.0):
+    if AUDIT_PIPELINE:
+        AUDIT_PIPELINE.flush(timeout)
+
+def get_audit_stats():
+    return AUDIT_PIPELINE.get_stats() if AUDIT_PIPELINE else {}
+
+def query_audit(event=None, module=None, user=None, since=None, until=None, limit=None, directory=None):
+    """
+    Returns matching audit entries, oldest first, e.g.
+    query_audit(event="indulgent_mode_triggered", user="alice", since=time.time() - 3600).
+    Pending entries from this process are written first.
+    """
+    settings = audit_settings()
+    flush_audit()
+    store = AuditSegmentStore(directory or settings["directory"], settings["bucket_seconds"], max_segments=None, max_total_bytes=None)
+    return list(store.query(event, module, user, since, until, limit))
+
+def close_audit():
+    if AUDIT_PIPELINE:
+        AUDIT_PIPELINE.close()
+
+atexit.register(close_audit)
+
+def _on_config_reload(config, previous):
+    global AUDIT_PIPELINE
+    settings = audit_settings(config)
+    if settings == audit_settings(previous):
+        return
+    old_pipeline = AUDIT_PIPELINE
+    AUDIT_PIPELINE = _build_pipeline(settings)
+    if old_pipeline:
+        old_pipeline.close()
+
+subscribe_config(_on_config_reload)
@@ -0,0 +1,120 @@
+"""
+automaton.py — Multi-pattern phrase matching for DLI trigger lists
+
+Builds an Aho-Corasick automaton over one or more named phrase lists and finds every
+occurrence of every phrase in a single scan of the text.
+Used by semantics.py (match_phrase, detect_euphemism) and detectRealityMode.py.
+Drafted collaboratively with Bob Greenwade and Copilot.
+"""
+
+import threading
+from collections import deque
+
+class PhraseAutomaton:
+    """
+    Case-insensitive substring matcher for named phrase lists.
+    phrase_lists: dictionary of list name -> list of phrases (kept by reference;
+    call invalidate() after changing it)
+    """
+
+    def __init__(self, phrase_lists=None):
+        self.phrase_lists = phrase_lists if phrase_lists is not None else {}
+        self._compiled = None
+        self._lock = threading.Lock()
+
+    def add_list(self, name, phrases):
+        self.phrase_lists.setdefault(name, []).extend(phrases)
+        self.invalidate()
+
+    def invalidate(self):
+        """Drops the compiled automaton so it is rebuilt on next use."""
+        with self._lock:
+            self._compiled = None
+
+    def _build(self):
+        # Each pattern is stored once, with every list it belongs to
+        patterns = {}
+        for name, phrases in self.phrase_lists.items():
+            for phrase in phrases:
+                key = phrase.lower()
+                if not key:
+                    continue
+                entry = patterns.setdefault(key, {"phrase": phrase, "members": [], "lists": []})
+                if (name, phrase) not in entry["members"]:
+                    entry["members"].append((name, phrase))
+                if name not in entry["lists"]:
+                    entry["lists"].append(name)
+
+        goto = [{}]
+        outputs = [[]]
+        for key in patterns:
+            state = 0
+            for ch in key:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    goto.append({})
+                    outputs.append([])
+                    nxt = len(goto) - 1
+                    goto[state][ch] = nxt
+                state = nxt
+            outputs[state].append(key)
+
+        # Breadth-first pass to wire failure links and inherit suffix outputs
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                outputs[nxt] = outputs[nxt] + outputs[fail[nxt]]
+
+        return goto, fail, outputs, patterns
+
+    def _get_compiled(self):
+        compiled = self._compiled
+        if compiled is None:
+            with self._lock:
+                if self._compiled is None:
+                    self._compiled = self._build()
+                compiled = self._compiled
+        return compiled
+
+    def find_all(self, text):
+        """
+        Returns every phrase occurrence as a list of dictionaries with:
+        phrase, start, end (offsets into text.lower()), and lists (names it belongs to).
+        """
+        goto, fail, outputs, patterns = self._get_compiled()
+        hits = []
+        state = 0
+        for i, ch in enumerate(text.lower()):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for key in outputs[state]:
+                entry = patterns[key]
+                hits.append({
+                    "phrase": entry["phrase"],
+                    "start": i - len(key) + 1,
+                    "end": i + 1,
+                    "lists": entry["lists"]
+                })
+        return hits
+
+    def match(self, text):
+        """
+        Returns {list_name: [matched phrases]} in order of first appearance.
+        Lists with no matches are omitted.
+        """
+        _, _, _, patterns = self._get_compiled()
+        matches = {}
+        for hit in self.find_all(text):
+            for name, phrase in patterns[hit["phrase"].lower()]["members"]:
+                fired = matches.setdefault(name, [])
+                if phrase not in fired:
+                    fired.append(phrase)
+        return matches
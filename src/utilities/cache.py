@@ -0,0 +1,391 @@
+"""
+cache.py — Bounded in-process caches for DLI hot paths
+
+Provides a thread-safe LRU cache with a size cap, hit/miss counters, and optional JSON warm files,
+plus an opt-in, content-addressed result cache with TTL and memory limits, and a variant cache
+that serves several stored results per key round-robin.
+Used by semantics.py for WordNet lookups, by emotion.py/confidence.py for analysis results,
+and by paraphrase.py for LLM paraphrases.
+Drafted collaboratively with Bob Greenwade and Copilot.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache.
+    maxsize: maximum number of entries kept before the oldest is evicted
+    name: label used in stats and log lines
+    """
+
+    def __init__(self, maxsize=4096, name="cache"):
+        self.maxsize = maxsize
+        self.name = name
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def get_or_compute(self, key, compute):
+        """
+        Returns the cached value for key, calling compute(key) and storing the result on a miss.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = self.set(key, compute(key))
+        return value
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def items(self):
+        with self._lock:
+            return list(self._data.items())
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def reset_stats(self):
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+    def snapshot(self, encode=None):
+        """
+        Returns cache contents as a plain dictionary.
+        encode: optional callable to make values JSON-serializable (e.g., set -> list)
+        """
+        return {k: (encode(v) if encode else v) for k, v in self.items()}
+
+    def warm(self, entries, decode=None):
+        """
+        Loads entries from a dictionary produced by snapshot().
+        decode: optional callable applied to each stored value
+        Returns the number of entries loaded.
+        """
+        for key, value in entries.items():
+            self.set(key, decode(value) if decode else value)
+        return len(entries)
+
+class ResultCache:
+    """
+    Opt-in cache for analysis results, keyed by a hash of the input text.
+    Entries expire after ttl seconds; least recently used entries are evicted once
+    maxsize entries or max_bytes (approximate) are exceeded.
+    Disabled until configure(enabled=True) is called.
+    """
+
+    def __init__(self, name, maxsize=10000, ttl=600, max_bytes=16 * 1024 * 1024, enabled=False):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._data = OrderedDict()  # key -> (expires_at, size, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def configure(self, enabled=True, maxsize=None, ttl=None, max_bytes=None):
+        with self._lock:
+            self.enabled = enabled
+            if maxsize is not None:
+                self.maxsize = maxsize
+            if ttl is not None:
+                self.ttl = ttl
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            self._evict()
+        if not enabled:
+            self.clear()
+        return self.stats()
+
+    @staticmethod
+    def key(text):
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, text):
+        """
+        Returns a copy of the cached result for text, or None on a miss (or when disabled).
+        """
+        if not self.enabled:
+            return None
+        key = self.key(text)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, size, value = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(value)
+
+    def set(self, text, value):
+        """
+        Stores a result for text (if enabled) and returns the value unchanged.
+        """
+        if not self.enabled:
+            return value
+        key = self.key(text)
+        stored = copy.deepcopy(value)
+        size = _estimate_size(key) + _estimate_size(stored)
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (time.monotonic() + self.ttl, size, stored)
+            self._bytes += size
+            self._evict()
+        return value
+
+    def _remove(self, key):
+        _, size, _ = self._data.pop(key)
+        self._bytes -= size
+
+    def _evict(self):
+        while self._data and (len(self._data) > self.maxsize or self._bytes > self.max_bytes):
+            key = next(iter(self._data))
+            self._remove(key)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "enabled": self.enabled,
+            "size": len(self._data),
+            "bytes": self._bytes,
+            "maxsize": self.maxsize,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+def _estimate_size(value):
+    """Approximate in-memory size of a JSON-like value, in bytes."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_estimate_size(k) + _estimate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_estimate_size(v) for v in value)
+    return size
+
+def save_warm_file(path, sections):
+    """
+    Writes several cache snapshots to one JSON warm file.
+    sections: dictionary of section name -> snapshot dictionary
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(sections, f)
+    os.replace(tmp_path, path)
+    return sum(len(entries) for entries in sections.values())
+
+def load_warm_file(path):
+    """
+    Reads a JSON warm file written by save_warm_file().
+    Returns an empty dictionary if the file is missing or unreadable.
+    """
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"[CACHE] Could not load warm file {path}: {e}")
+        return {}
+
+class VariantCache:
+    """
+    Cache that keeps up to `variants` different results per key and serves them round-robin,
+    so repeated inputs stay varied without another expensive call once the pool is full
+    (after `variants` add() calls, even if some results were duplicates).
+    Entries expire ttl seconds after they were first stored (wall-clock, so they survive a save/load);
+    least recently used keys are evicted past maxsize.
+    """
+
+    def __init__(self, name, variants=3, maxsize=4096, ttl=86400, enabled=True):
+        self.name = name
+        self.variants = variants
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.enabled = enabled
+        self._data = OrderedDict()  # key -> {"expires_at", "variants", "attempts", "next"}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def configure(self, enabled=True, variants=None, maxsize=None, ttl=None):
+        with self._lock:
+            self.enabled = enabled
+            if variants is not None:
+                self.variants = variants
+            if maxsize is not None:
+                self.maxsize = maxsize
+            if ttl is not None:
+                self.ttl = ttl
+            self._evict()
+        if not enabled:
+            self.clear()
+        return self.stats()
+
+    @staticmethod
+    def key(*parts):
+        """Stable hash of JSON-serializable key parts."""
+        data = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+        return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, key):
+        """
+        Returns the next cached variant for key, or None while fewer than `variants` are stored
+        (so the caller produces and add()s another one).
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry["expires_at"] < time.time():
+                del self._data[key]
+                self.expirations += 1
+                entry = None
+            if entry is None or not entry["variants"] or entry["attempts"] < self.variants:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            index = entry["next"] % len(entry["variants"])
+            entry["next"] = index + 1
+            return entry["variants"][index]
+
+    def add(self, key, value):
+        """Stores another variant for key (duplicates are ignored). Returns value unchanged."""
+        if not self.enabled:
+            return value
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry["expires_at"] < time.time():
+                entry = self._data[key] = {"expires_at": time.time() + self.ttl, "variants": [], "attempts": 0, "next": 0}
+            entry["attempts"] += 1
+            if value not in entry["variants"] and len(entry["variants"]) < self.variants:
+                entry["variants"].append(value)
+            self._data.move_to_end(key)
+            self._evict()
+        return value
+
+    def _evict(self):
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def snapshot(self):
+        """Returns unexpired entries as a JSON-serializable dictionary."""
+        now = time.time()
+        with self._lock:
+            return {
+                key: {"expires_at": entry["expires_at"], "variants": list(entry["variants"]), "attempts": entry["attempts"]}
+                for key, entry in self._data.items() if entry["expires_at"] >= now
+            }
+
+    def warm(self, entries):
+        """Loads entries produced by snapshot(), skipping expired ones. Returns the number loaded."""
+        now = time.time()
+        loaded = 0
+        with self._lock:
+            for key, entry in entries.items():
+                if entry.get("expires_at", 0) < now:
+                    continue
+                self._data[key] = {
+                    "expires_at": entry["expires_at"],
+                    "variants": list(entry.get("variants", []))[:self.variants],
+                    "attempts": entry.get("attempts", len(entry.get("variants", []))),
+                    "next": 0
+                }
+                loaded += 1
+            self._evict()
+        return loaded
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "enabled": self.enabled,
+            "size": len(self._data),
+            "variants": self.variants,
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
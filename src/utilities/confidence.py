@@ -10,8 +10,9 @@ Drafted collaboratively with Copilot and Bob Greenwade.
 import re
 import math
 from factCheck import validate_claim, TRUSTED_SOURCES
-from semantics import match_wordlist
+from semantics import TriggerMatcher
 from learning import run_learning
+from cache import ResultCache
 
 LOW_CONFIDENCE_MARKERS = [
     "maybe", "possibly", "some say", "unclear", "allegedly", "unverified", "theoretically", "hypothetically"
@@ -23,18 +24,36 @@ NEGATIVE_CONFIDENCE_MARKERS = [
     "disproven", "debunked", "illogical", "false", "fictional", "imaginary", "crackpot", "absurd"
 ]
 
+# Compiled once; checks all three marker lists in a single pass over the text
+CONFIDENCE_MATCHER = TriggerMatcher({
+    "low": LOW_CONFIDENCE_MARKERS,
+    "high": HIGH_CONFIDENCE_MARKERS,
+    "negative": NEGATIVE_CONFIDENCE_MARKERS
+})
+
+# Opt-in result cache: CONFIDENCE_CACHE.configure(enabled=True, ttl=..., max_bytes=...)
+# Cleared whenever the marker lists change
+CONFIDENCE_CACHE = ResultCache("tag_confidence_level")
+CONFIDENCE_MATCHER.subscribe(CONFIDENCE_CACHE.clear)
+
 def tag_confidence_level(text):
     """
     Assigns a confidence score to a given bot response.
     Returns a float between 0.0 (low confidence) and 1.0 (high confidence).
+    Served from CONFIDENCE_CACHE when it is enabled.
     """
+    cached = CONFIDENCE_CACHE.get(text)
+    if cached is not None:
+        return cached
+
     score = 0.5  # Neutral baseline
+    fired = CONFIDENCE_MATCHER.match(text)
 
-    if match_wordlist(text, LOW_CONFIDENCE_MARKERS):
+    if "low" in fired:
         score -= 0.1
-    if match_wordlist(text, HIGH_CONFIDENCE_MARKERS):
+    if "high" in fired:
         score += 0.1
-    if match_wordlist(text, NEGATIVE_CONFIDENCE_MARKERS):
+    if "negative" in fired:
         score -= 0.2  # Stronger penalty for epistemic rejection
 
     # Optional ML override
@@ -44,10 +63,15 @@ def tag_confidence_level(text):
     except Exception:
         pass
 
-    return max(0.0, min(1.0, score))
+    return CONFIDENCE_CACHE.set(text, max(0.0, min(1.0, score)))
 
-def overlay_certainty(text):
-    score = tag_confidence_level(text)
+def overlay_certainty(text, score=None):
+    """
+    Returns the response with confidence and source-verification metadata.
+    score: optional precomputed confidence (e.g., TurnFeatures.confidence)
+    """
+    if score is None:
+        score = tag_confidence_level(text)
     sources = validate_claim(text)
     verified = len(sources) > 0
     return {
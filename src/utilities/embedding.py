@@ -7,35 +7,110 @@ and LLM-friendly invocation.
 Drafted collaboratively with Bob Greenwade and Copilot.
 """
 
-import json
+import math
+import zlib
+import numpy as np
 import requests
 from emotion import analyze_emotion
 from confidence import tag_confidence_level
 from learning import run_learning
+from config import load_config
 
-def load_config(path="config.json"):
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return {
-            "ENABLE_EMBEDDING_CONTEXT": True,
-            "PERSONA": {
-                "tone": "neutral-empathetic",
-                "style": "clarifying"
-            }
-        }
-
-CONFIG = load_config()
+# Used when config.json has no PERSONA section
+DEFAULT_PERSONA = {
+    "tone": "neutral-empathetic",
+    "style": "clarifying"
+}
 
-def fetch_external_profile(api_url, user_text):
+def fetch_external_profile(api_url, user_text, timeout=5):
     """Optional enrichment from external persona or tone API."""
     try:
-        response = requests.post(api_url, json={"text": user_text})
+        response = requests.post(api_url, json={"text": user_text}, timeout=timeout)
         return response.json() if response.status_code == 200 else {}
     except Exception:
         return {}
 
+class HashedEmbedder:
+    """
+    Fast hashed bag-of-words embedding.
+    Tokens map to buckets with a non-cryptographic hash (CRC32), cached per token.
+    Vectors are L2-normalized float32, so pair similarity is a plain dot product
+    (same cosine semantics as before, without sklearn).
+    """
+
+    def __init__(self, dim=512, cache_size=50000):
+        self.dim = dim
+        self.cache_size = cache_size
+        self._buckets = {}
+
+    def bucket(self, token):
+        index = self._buckets.get(token)
+        if index is None:
+            if len(self._buckets) >= self.cache_size:
+                self._buckets.clear()
+            index = self._buckets[token] = zlib.crc32(token.encode("utf-8")) % self.dim
+        return index
+
+    def encode_sparse(self, text):
+        """Returns {bucket: weight} with unit L2 norm (empty for empty text)."""
+        counts = {}
+        for token in text.lower().split():
+            index = self.bucket(token)
+            counts[index] = counts.get(index, 0) + 1
+        norm = math.sqrt(sum(c * c for c in counts.values()))
+        return {index: c / norm for index, c in counts.items()} if norm else {}
+
+    def encode(self, text):
+        """Returns a dense float32 vector of length dim."""
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for index, weight in self.encode_sparse(text).items():
+            vector[index] = weight
+        return vector
+
+    def encode_batch(self, texts):
+        """Encodes many texts into one (len(texts), dim) float32 matrix of unit rows."""
+        rows, cols = [], []
+        for i, text in enumerate(texts):
+            for token in text.lower().split():
+                rows.append(i)
+                cols.append(self.bucket(token))
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        np.add.at(matrix, (rows, cols), 1.0)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def similarity(self, a, b):
+        """
+        Cosine similarity between two texts, sparse encodings, or dense vectors.
+        """
+        if isinstance(a, str):
+            a = self.encode_sparse(a)
+        if isinstance(b, str):
+            b = self.encode_sparse(b)
+        if isinstance(a, dict) and isinstance(b, dict):
+            if len(a) > len(b):
+                a, b = b, a
+            return sum(weight * b.get(index, 0.0) for index, weight in a.items())
+        return float(np.dot(a, b))
+
+    def consecutive_similarities(self, matrix):
+        """Returns the similarity of each row to the next, for a matrix from encode_batch()."""
+        if len(matrix) < 2:
+            return np.zeros(0, dtype=np.float32)
+        return np.einsum("ij,ij->i", matrix[:-1], matrix[1:])
+
+EMBEDDER = HashedEmbedder()
+
+def get_embedding(text, dim=512):
+    """
+    Returns a pseudo-embedding vector for the given text.
+    Uses token hashing for deterministic output.
+    Replace with real model later.
+    """
+    embedder = EMBEDDER if dim == EMBEDDER.dim else HashedEmbedder(dim)
+    return embedder.encode(text)
+
 def get_emotional_context(text):
     profile = analyze_emotion(text)
     return {
@@ -63,8 +138,10 @@ def enrich_embedding_context(base_context, external_profile):
     return enriched
 
 def get_embedding_context(user_text, bot_text, override_type=None, external_api=None):
-    if not CONFIG.get("ENABLE_EMBEDDING_CONTEXT", True):
+    config = load_config()
+    if not config.get("ENABLE_EMBEDDING_CONTEXT", True):
         return {}
+    persona = config.get("PERSONA", DEFAULT_PERSONA)
 
     user_emotion = analyze_emotion(user_text)
     bot_emotion = analyze_emotion(bot_text)
@@ -74,8 +151,8 @@ def get_embedding_context(user_text, bot_text, override_type=None, external_api=
         "user_emotion": user_emotion["emotion_vector"],
         "bot_emotion": bot_emotion["emotion_vector"],
         "bot_confidence": confidence,
-        "persona_tone": CONFIG["PERSONA"]["tone"],
-        "persona_style": CONFIG["PERSONA"]["style"]
+        "persona_tone": persona.get("tone", DEFAULT_PERSONA["tone"]),
+        "persona_style": persona.get("style", DEFAULT_PERSONA["style"])
     }
 
     if override_type:
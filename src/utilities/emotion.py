@@ -8,9 +8,10 @@ Drafted collaboratively with Bob Greenwade and Copilot.
 """
 
 import json
-from semantics import match_wordlist
+from semantics import TriggerMatcher
 from textblob import TextBlob
 from learning import run_learning
+from cache import ResultCache
 
 # Core Plutchik emotions with basic cues
 PLUTCHIK_EMOTIONS = {
@@ -36,16 +37,21 @@ PLUTCHIK_EXTENSIONS = {
     "boredom": ["indifferent", "apathetic"]
 }
 
+# Compiled once; answers every emotion in a single pass over the text
+EMOTION_MATCHER = TriggerMatcher(PLUTCHIK_EMOTIONS)
+
+# Opt-in result cache: EMOTION_CACHE.configure(enabled=True, ttl=..., max_bytes=...)
+# Cleared whenever the emotion cue lists change
+EMOTION_CACHE = ResultCache("analyze_emotion")
+EMOTION_MATCHER.subscribe(EMOTION_CACHE.clear)
+
 def get_emotion_vector(text):
     """
     Returns a dictionary with Plutchik emotions and their presence (0 or 1).
     Future-ready for nuanced and compound emotions.
     """
-    vector = {emotion: 0 for emotion in PLUTCHIK_EMOTIONS}
-    for emotion, cues in PLUTCHIK_EMOTIONS.items():
-        if match_wordlist(text, cues):
-            vector[emotion] = 1
-    return vector
+    fired = EMOTION_MATCHER.match(text)
+    return {emotion: 1 if emotion in fired else 0 for emotion in PLUTCHIK_EMOTIONS}
 
 def emotion_intensity(vector):
     """
@@ -57,7 +63,12 @@ def emotion_intensity(vector):
 def analyze_emotion(text):
     """
     Returns full emotional metadata including vector, intensity, polarity, and subjectivity.
+    Served from EMOTION_CACHE when it is enabled.
     """
+    cached = EMOTION_CACHE.get(text)
+    if cached is not None:
+        return cached
+
     blob = TextBlob(text)
     polarity = blob.sentiment.polarity
     subjectivity = blob.sentiment.subjectivity
@@ -72,12 +83,12 @@ def analyze_emotion(text):
     except Exception:
         pass
 
-    return {
+    return EMOTION_CACHE.set(text, {
         "emotion_vector": vector,
         "intensity": intensity,
         "polarity": round(polarity, 2),
         "subjectivity": round(subjectivity, 2)
-    }
+    })
 
 def map_emotion_to_tone(emotion_vector):
     """
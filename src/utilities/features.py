@@ -0,0 +1,88 @@
+"""
+features.py — Per-turn analysis shared across detection functions and protocols
+
+Wraps one user or bot turn and computes each piece of analysis (tokens, lemmas, emotion,
+confidence, hashed embedding, reality mode) lazily and at most once.
+Functions and protocols accept a TurnFeatures anywhere they accept raw text.
+Drafted collaboratively with Bob Greenwade and Copilot.
+"""
+
+from functools import cached_property
+from semantics import normalize_word
+from emotion import analyze_emotion
+from confidence import tag_confidence_level
+from embedding import get_embedding
+
+class TurnFeatures:
+    """
+    Lazily computed analysis for a single conversational turn.
+    Build one per turn and pass it to every detector instead of the raw string.
+    """
+
+    def __init__(self, text):
+        self.text = text or ""
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return f"TurnFeatures({self.text!r})"
+
+    @cached_property
+    def tokens(self):
+        return self.text.lower().split()
+
+    @cached_property
+    def lemmas(self):
+        return [normalize_word(token) for token in self.tokens]
+
+    @cached_property
+    def emotion(self):
+        """Full analyze_emotion() result: emotion_vector, intensity, polarity, subjectivity."""
+        return analyze_emotion(self.text)
+
+    @property
+    def emotion_vector(self):
+        return self.emotion["emotion_vector"]
+
+    @property
+    def intensity(self):
+        return self.emotion["intensity"]
+
+    @property
+    def polarity(self):
+        return self.emotion["polarity"]
+
+    @property
+    def subjectivity(self):
+        return self.emotion["subjectivity"]
+
+    @cached_property
+    def confidence(self):
+        return tag_confidence_level(self.text)
+
+    @cached_property
+    def embedding(self):
+        return get_embedding(self.text)
+
+    @cached_property
+    def reality(self):
+        """Full classify_reality_mode() result for this turn."""
+        from detectRealityMode import classify_reality_mode  # Deferred: functions layer imports this module
+        return classify_reality_mode(self)
+
+    @property
+    def reality_mode(self):
+        return self.reality["mode"]
+
+    @property
+    def reality_mode_scores(self):
+        return self.reality.get("scores", {})
+
+def as_features(turn):
+    """Returns turn unchanged if it is already a TurnFeatures, otherwise wraps the raw text."""
+    return turn if isinstance(turn, TurnFeatures) else TurnFeatures(turn)
+
+def text_of(turn):
+    """Returns the raw text for either a TurnFeatures or a string."""
+    return turn.text if isinstance(turn, TurnFeatures) else turn
@@ -2,11 +2,15 @@
 learning.py — Central ML integration utility for DLI
 
 Detects available ML packages, routes tasks to best option, and executes learning-enhanced functions.
+Package probing and model loading happen once per process via the shared ModelRegistry.
 Drafted collaboratively with Bob Greenwade and Copilot.
 """
 
 import importlib
 import json
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 
 ML_PACKAGES = {
     "spacy": "spaCy NLP",
@@ -18,16 +22,130 @@ ML_PACKAGES = {
     "cohere": "Cohere API"
 }
 
+# Models that need an explicit load step; other packages are used as imported modules
+MODEL_LOADERS = {
+    "spacy": lambda module: module.load("en_core_web_sm")
+}
+
+class ModelRegistry:
+    """
+    Long-lived registry of ML packages and loaded models.
+    Probes installed packages once, loads each model lazily exactly once, keeps it warm,
+    and records load time, call latency, and failure counts per task.
+    """
+
+    def __init__(self, packages=None):
+        self.packages = packages or ML_PACKAGES
+        self._available = None
+        self._modules = {}
+        self._models = {}
+        self._load_errors = {}
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self.load_times = {}
+        self.task_stats = {}
+
+    def available(self):
+        """Returns installed ML packages, probing imports only on first use."""
+        if self._available is None:
+            with self._lock:
+                if self._available is None:
+                    available = {}
+                    for pkg in self.packages:
+                        try:
+                            self._modules[pkg] = importlib.import_module(pkg)
+                            available[pkg] = self.packages[pkg]
+                        except ImportError:
+                            continue
+                    self._available = available
+        return self._available
+
+    def get_model(self, package):
+        """
+        Returns the warm model (or module) for a package, loading it on first request.
+        A failed load is remembered and re-raised until reset() is called.
+        """
+        if package in self._models:
+            return self._models[package]
+        if package in self._load_errors:
+            raise self._load_errors[package]
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(package, threading.Lock())
+        with load_lock:
+            if package in self._models:
+                return self._models[package]
+            if package in self._load_errors:
+                raise self._load_errors[package]
+            start = time.perf_counter()
+            try:
+                module = self._modules.get(package) or importlib.import_module(package)
+                loader = MODEL_LOADERS.get(package)
+                model = loader(module) if loader else module
+            except Exception as e:
+                self._load_errors[package] = e
+                print(f"[Learning] Failed to load {package}: {e}")
+                raise
+            finally:
+                self.load_times[package] = round(time.perf_counter() - start, 4)
+            self._models[package] = model
+            return model
+
+    def record_call(self, task, package, latency, failures=0, items=1):
+        """Records one (possibly batched) execution of a task."""
+        with self._lock:
+            stats = self.task_stats.setdefault(task, {
+                "package": package,
+                "calls": 0,
+                "batches": 0,
+                "failures": 0,
+                "total_latency": 0.0,
+                "max_latency": 0.0
+            })
+            stats["package"] = package
+            stats["calls"] += items
+            stats["batches"] += 1
+            stats["failures"] += failures
+            stats["total_latency"] += latency
+            stats["max_latency"] = max(stats["max_latency"], latency)
+
+    def get_stats(self):
+        """
+        Returns per-task call counts, failures, latency (per batch), and the load time of the backing package.
+        """
+        report = {}
+        with self._lock:
+            for task, stats in self.task_stats.items():
+                report[task] = {
+                    "package": stats["package"],
+                    "calls": stats["calls"],
+                    "batches": stats["batches"],
+                    "failures": stats["failures"],
+                    "avg_latency": round(stats["total_latency"] / stats["batches"], 4),
+                    "max_latency": round(stats["max_latency"], 4),
+                    "load_time": self.load_times.get(stats["package"])
+                }
+        return report
+
+    def reset(self):
+        """Forgets probe results, loaded models, and stats (e.g., after installing a package)."""
+        with self._lock:
+            self._available = None
+            self._modules.clear()
+            self._models.clear()
+            self._load_errors.clear()
+            self.load_times.clear()
+            self.task_stats.clear()
+
+REGISTRY = ModelRegistry()
+
 def detect_installed_ml():
     """Returns a dictionary of installed ML packages."""
-    available = {}
-    for pkg in ML_PACKAGES:
-        try:
-            importlib.import_module(pkg)
-            available[pkg] = ML_PACKAGES[pkg]
-        except ImportError:
-            continue
-    return available
+    return REGISTRY.available()
+
+def get_learning_stats():
+    """Returns per-task latency, failure, and model load statistics."""
+    return REGISTRY.get_stats()
 
 def select_ml_for(task):
     """Selects the best ML package for a given task."""
@@ -46,18 +164,12 @@ def select_ml_for(task):
             return preferred
     return None
 
-def run_learning(task, input_data):
-    """Executes ML-enhanced logic for a given task and input."""
-    package = select_ml_for(task)
-    if not package:
-        return {"error": "No suitable ML package installed."}
-
+def _run_single(task, package, input_data):
+    """Runs one input through the selected package. Returns the output dictionary."""
     result = {}
-
     try:
         if package == "textblob":
-            from textblob import TextBlob
-            blob = TextBlob(input_data.get("text", ""))
+            blob = REGISTRY.get_model("textblob").TextBlob(input_data.get("text", ""))
             if task == "tone":
                 result["tone"] = "positive" if blob.sentiment.polarity > 0 else "negative"
             elif task == "emotion":
@@ -65,13 +177,8 @@ def run_learning(task, input_data):
                 result["subjectivity"] = blob.sentiment.subjectivity
 
         elif package == "spacy":
-            import spacy
-            nlp = spacy.load("en_core_web_sm")
-            doc = nlp(input_data.get("text", ""))
-            if task == "parsing":
-                result["tokens"] = [token.text for token in doc]
-            elif task == "loop_detection":
-                result["loop_detected"] = any(sent.text.count("again") > 1 for sent in doc.sents)
+            nlp = REGISTRY.get_model("spacy")
+            result.update(_spacy_result(task, nlp(input_data.get("text", ""))))
 
         elif package == "sklearn":
             # Placeholder for sklearn logic
@@ -87,12 +194,184 @@ def run_learning(task, input_data):
     except Exception as e:
         result["error"] = str(e)
 
-    return {
-        "task": task,
-        "package": package,
-        "input": input_data,
-        "output": result
-    }
+    return result
+
+def _spacy_result(task, doc):
+    result = {}
+    if task == "parsing":
+        result["tokens"] = [token.text for token in doc]
+    elif task == "loop_detection":
+        result["loop_detected"] = any(sent.text.count("again") > 1 for sent in doc.sents)
+    return result
+
+def _run_spacy_batch(task, inputs):
+    """Runs all inputs through one nlp.pipe() call; malformed inputs fail individually."""
+    results = [None] * len(inputs)
+    texts, positions = [], []
+    for i, input_data in enumerate(inputs):
+        try:
+            texts.append(input_data.get("text", ""))
+            positions.append(i)
+        except Exception as e:
+            results[i] = {"error": str(e)}
+    try:
+        nlp = REGISTRY.get_model("spacy")
+        for i, doc in zip(positions, nlp.pipe(texts)):
+            results[i] = _spacy_result(task, doc)
+    except Exception as e:
+        for i in positions:
+            results[i] = {"error": str(e)}
+    return results
+
+def run_learning_batch(task, inputs):
+    """
+    Executes ML-enhanced logic for a list of inputs in one call.
+    Returns one result per input, in order, shaped like run_learning() results.
+    """
+    inputs = list(inputs)
+    package = select_ml_for(task)
+    if not package:
+        return [{"error": "No suitable ML package installed."} for _ in inputs]
+
+    start = time.perf_counter()
+    if package == "spacy":
+        outputs = _run_spacy_batch(task, inputs)
+    else:
+        outputs = [_run_single(task, package, input_data) for input_data in inputs]
+
+    failures = sum(1 for output in outputs if "error" in output)
+    REGISTRY.record_call(task, package, time.perf_counter() - start, failures=failures, items=len(inputs))
+
+    return [
+        {
+            "task": task,
+            "package": package,
+            "input": input_data,
+            "output": output
+        }
+        for input_data, output in zip(inputs, outputs)
+    ]
+
+class MicroBatcher:
+    """
+    Collects concurrent single run_learning() calls per task for up to max_wait_ms
+    or max_items, runs them as one run_learning_batch() call, and hands each caller its result.
+    tasks: optional iterable limiting which tasks are batched (default: all)
+    result_timeout: seconds run_learning() waits for a batched result before running the input itself
+    """
+
+    def __init__(self, max_items=16, max_wait_ms=5, tasks=None, runner=None, result_timeout=30.0):
+        self.max_items = max_items
+        self.max_wait = max_wait_ms / 1000.0
+        self.result_timeout = result_timeout
+        self.tasks = set(tasks) if tasks else None
+        self.runner = runner or run_learning_batch
+        self._pending = {}  # task -> list of (arrival time, input, future)
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    def handles(self, task):
+        return self._running and (self.tasks is None or task in self.tasks)
+
+    def start(self):
+        with self._cond:
+            if not self._running:
+                self._running = True
+                self._thread = threading.Thread(target=self._loop, name="dli-micro-batcher", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops the scheduler after flushing anything still pending."""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, task, input_data):
+        """Queues one input and returns a Future resolving to its run_learning() result."""
+        future = Future()
+        with self._cond:
+            if not self._running:
+                self._dispatch(task, [(time.monotonic(), input_data, future)])
+                return future
+            self._pending.setdefault(task, []).append((time.monotonic(), input_data, future))
+            self._cond.notify()
+        return future
+
+    def _take_ready(self, flush=False):
+        now = time.monotonic()
+        ready = []
+        for task, items in list(self._pending.items()):
+            if flush or len(items) >= self.max_items or now - items[0][0] >= self.max_wait:
+                ready.append((task, items[:self.max_items]))
+                remaining = items[self.max_items:]
+                if remaining:
+                    self._pending[task] = remaining
+                else:
+                    del self._pending[task]
+        return ready
+
+    def _next_deadline(self):
+        return min(items[0][0] for items in self._pending.values()) + self.max_wait
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while self._running and not self._pending:
+                    self._cond.wait()
+                if not self._running and not self._pending:
+                    return
+                ready = self._take_ready(flush=not self._running)
+                if not ready:
+                    self._cond.wait(max(0.0, self._next_deadline() - time.monotonic()))
+                    continue
+            for task, items in ready:
+                self._dispatch(task, items)
+
+    def _dispatch(self, task, items):
+        try:
+            results = list(self.runner(task, [input_data for _, input_data, _ in items]))
+            if len(results) != len(items):
+                raise RuntimeError(f"{task} batch returned {len(results)} results for {len(items)} inputs")
+            for (_, _, future), result in zip(items, results):
+                future.set_result(result)
+        except Exception as e:
+            # Fail every caller still waiting; futures already resolved are left alone
+            for _, _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+
+BATCHER = None
+
+def enable_micro_batching(max_items=16, max_wait_ms=5, tasks=None, result_timeout=30.0):
+    """
+    Routes single run_learning() calls through a shared MicroBatcher.
+    Worth enabling for transformer-backed tasks under concurrent load.
+    """
+    global BATCHER
+    disable_micro_batching()
+    BATCHER = MicroBatcher(max_items=max_items, max_wait_ms=max_wait_ms, tasks=tasks, result_timeout=result_timeout).start()
+    return BATCHER
+
+def disable_micro_batching():
+    global BATCHER
+    if BATCHER is not None:
+        BATCHER.stop()
+        BATCHER = None
+
+def run_learning(task, input_data):
+    """Executes ML-enhanced logic for a given task and input."""
+    batcher = BATCHER
+    if batcher is not None and batcher.handles(task):
+        try:
+            return batcher.submit(task, input_data).result(timeout=batcher.result_timeout)
+        except FutureTimeoutError:
+            print(f"[Learning] Batched {task} call timed out after {batcher.result_timeout}s; running it directly")
+    return run_learning_batch(task, [input_data])[0]
 
 def log_learning_outcome(task, input_data, output_data):
     """Logs learning result for audit or refinement."""
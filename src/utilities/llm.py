@@ -0,0 +1,168 @@
+"""
+llm.py — Pooled HTTP client for the hosting LLM endpoint
+
+Keeps one keep-alive session with a bounded connection pool, applies connect/read timeouts,
+and retries transient failures (connection errors, timeouts, 429/5xx) a bounded number of times
+with jittered exponential backoff. Async callers share a concurrency limit per event loop.
+Used by paraphrase.py; settings come from the "llm" section of config.json.
+Drafted collaboratively with Bob Greenwade and Copilot.
+"""
+
+import asyncio
+import random
+import threading
+import time
+import weakref
+import requests
+from requests.adapters import HTTPAdapter
+from config import load_config, subscribe_config
+
+# Defaults for anything the "llm" config section leaves out
+LLM_DEFAULTS = {
+    "endpoint": "http://localhost:5000/paraphrase",
+    "model": "gpt-4",
+    "temperature": 0.7,
+    "connect_timeout": 3.0,
+    "timeout": 20.0,
+    "max_retries": 2,
+    "backoff": 0.25,
+    "max_backoff": 4.0,
+    "pool_size": 16,
+    "max_concurrency": 8
+}
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+class LLMClient:
+    """
+    Thread-safe client for the paraphrase endpoint.
+    complete(prompt) returns the paraphrased text or None after retries are exhausted;
+    complete_async(prompt) does the same without blocking the event loop.
+    """
+
+    def __init__(self, endpoint=None, model=None, temperature=None, connect_timeout=None, timeout=None,
+                 max_retries=None, backoff=None, max_backoff=None, pool_size=None, max_concurrency=None):
+        overrides = {
+            "endpoint": endpoint,
+            "model": model,
+            "temperature": temperature,
+            "connect_timeout": connect_timeout,
+            "timeout": timeout,
+            "max_retries": max_retries,
+            "backoff": backoff,
+            "max_backoff": max_backoff,
+            "pool_size": pool_size,
+            "max_concurrency": max_concurrency
+        }
+        settings = dict(LLM_DEFAULTS)
+        settings.update({k: v for k, v in overrides.items() if v is not None})
+        self.endpoint = settings["endpoint"]
+        self.model = settings["model"]
+        self.temperature = settings["temperature"]
+        self.timeout = (settings["connect_timeout"], settings["timeout"])
+        self.max_retries = settings["max_retries"]
+        self.backoff = settings["backoff"]
+        self.max_backoff = settings["max_backoff"]
+        self.max_concurrency = settings["max_concurrency"]
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings["pool_size"], pool_block=True)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._async_limits = weakref.WeakKeyDictionary()  # event loop -> asyncio.Semaphore
+        self._stats_lock = threading.Lock()
+        self.stats = {"calls": 0, "retries": 0, "failures": 0, "total_latency": 0.0}
+
+    @classmethod
+    def from_config(cls, config=None):
+        config = config if config is not None else load_config()
+        return cls(**{k: v for k, v in config.get("llm", {}).items() if k in LLM_DEFAULTS})
+
+    def _delay(self, attempt):
+        """Full-jitter exponential backoff."""
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+    def _record(self, latency, retries, failed):
+        with self._stats_lock:
+            self.stats["calls"] += 1
+            self.stats["retries"] += retries
+            self.stats["failures"] += int(failed)
+            self.stats["total_latency"] += latency
+
+    def complete(self, prompt):
+        """Sends one prompt. Returns the paraphrased text, or None if the call failed."""
+        payload = {
+            "model": self.model,
+            "temperature": self.temperature,
+            "prompt": prompt
+        }
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                response = self.session.post(self.endpoint, json=payload, timeout=self.timeout)
+                if response.status_code in RETRY_STATUS and attempt < self.max_retries:
+                    raise requests.HTTPError(f"{response.status_code} from LLM endpoint", response=response)
+                response.raise_for_status()
+                result = response.json().get("paraphrased", "").strip()
+                self._record(time.perf_counter() - start, attempt, failed=False)
+                return result
+            except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+                status = getattr(getattr(e, "response", None), "status_code", None)
+                retryable = status is None or status in RETRY_STATUS
+                if retryable and attempt < self.max_retries:
+                    time.sleep(self._delay(attempt))
+                    attempt += 1
+                    continue
+                print(f"LLM call failed: {e}")
+            except Exception as e:
+                print(f"LLM call failed: {e}")
+            self._record(time.perf_counter() - start, attempt, failed=True)
+            return None
+
+    def _async_limit(self):
+        loop = asyncio.get_running_loop()
+        limit = self._async_limits.get(loop)
+        if limit is None:
+            limit = self._async_limits[loop] = asyncio.Semaphore(self.max_concurrency)
+        return limit
+
+    async def complete_async(self, prompt):
+        """Async complete(); at most max_concurrency requests per event loop are in flight."""
+        async with self._async_limit():
+            return await asyncio.to_thread(self.complete, prompt)
+
+    def get_stats(self):
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats["avg_latency"] = round(stats["total_latency"] / stats["calls"], 4) if stats["calls"] else 0.0
+        return stats
+
+    def close(self):
+        self.session.close()
+
+LLM_CLIENT = None
+LLM_CLIENT_LOCK = threading.Lock()
+
+def get_llm_client():
+    """Returns the shared client, built from config on first use."""
+    global LLM_CLIENT
+    if LLM_CLIENT is None:
+        with LLM_CLIENT_LOCK:
+            if LLM_CLIENT is None:
+                LLM_CLIENT = LLMClient.from_config()
+    return LLM_CLIENT
+
+def reset_llm_client():
+    """Drops the shared client so the next call builds one from current settings."""
+    global LLM_CLIENT
+    with LLM_CLIENT_LOCK:
+        LLM_CLIENT = None
+
+def _on_config_reload(config, previous):
+    # In-flight requests keep the old session; it is closed when garbage collected
+    if config.get("llm") != previous.get("llm"):
+        reset_llm_client()
+
+subscribe_config(_on_config_reload)
@@ -3,21 +3,53 @@ logger.py — Utility module for intervention logging and decision tracing in DL
 
 Provides functions to record safeguard actions, trace decision paths, and export logs.
 Supports transparency, debugging, and optional audit workflows.
+Recent entries live in a bounded ring buffer; every entry is also sent to the shared
+audit pipeline (audit.py), which streams it to rotating, size-capped JSONL files.
 Drafted collaboratively with Bob Greenwade and Copilot.
 """
 
 import datetime
 import json
+import threading
+from collections import deque
+from config import load_config, subscribe_config
+from audit import audit_event
 
-# In-memory log store (replace with persistent storage if needed)
-LOG_STORE = []
+LOGGING_DEFAULTS = {
+    "buffer_size": 1000
+}
 
-def log_intervention(event_type, details, tone_tag=None):
+def logging_settings(config=None):
+    config = config if config is not None else load_config()
+    return {**LOGGING_DEFAULTS, **config.get("logging", {})}
+
+# Bounded in-memory view of recent entries; the full history goes to the audit pipeline (audit.py)
+LOG_STORE = deque(maxlen=logging_settings()["buffer_size"])
+LOG_STORE_LOCK = threading.Lock()
+
+def _record(entry, priority=None):
+    with LOG_STORE_LOCK:  # A config reload may be swapping in a resized buffer
+        LOG_STORE.append(entry)
+    audit_event(entry, priority)
+    return entry
+
+def _on_config_reload(config, previous):
+    global LOG_STORE
+    buffer_size = logging_settings(config)["buffer_size"]
+    with LOG_STORE_LOCK:
+        if buffer_size != LOG_STORE.maxlen:
+            LOG_STORE = deque(LOG_STORE, maxlen=buffer_size)
+
+subscribe_config(_on_config_reload)
+
+def log_intervention(event_type, details, tone_tag=None, priority=None, user=None):
     """
     Records a safeguard action with timestamp and metadata.
     event_type: string (e.g., "referToHuman", "ethicalPause", "mitigation")
     details: dictionary with relevant context
     tone_tag: optional string (e.g., "urgent", "empathetic", "neutral")
+    priority: optional audit priority ("low" to "critical"); defaults by event type
+    user: optional username, indexed for audit queries
     """
     entry = {
         "timestamp": datetime.datetime.utcnow().isoformat(),
@@ -25,24 +57,29 @@ def log_intervention(event_type, details, tone_tag=None):
         "details": details,
         "tone": tone_tag
     }
-    LOG_STORE.append(entry)
-    return entry
+    if user is not None:
+        entry["user"] = user
+    return _record(entry, priority)
 
-def trace_decision_path():
+def trace_decision_path(limit=10):
     """
     Returns a list of recent interventions for tracing logic.
     Useful for debugging or explaining bot behavior.
     """
-    return LOG_STORE[-10:]
+    with LOG_STORE_LOCK:
+        entries = list(LOG_STORE)
+    return entries[-limit:]
 
 def export_log(filepath="dli_log.json"):
     """
-    Exports the full log store to a JSON file.
-    Optional: replace with platform-specific export logic.
+    Exports the in-memory log buffer (at most logging.buffer_size recent entries) to a JSON file.
+    The complete, queryable history is in the audit segments (audit.py, query_audit()).
     """
+    with LOG_STORE_LOCK:
+        entries = list(LOG_STORE)
     try:
         with open(filepath, "w") as f:
-            json.dump(LOG_STORE, f, indent=2)
+            json.dump(entries, f, indent=2)
         return True
     except Exception as e:
         print(f"Export failed: {e}")
@@ -56,14 +93,13 @@ def log_transcript_creation(filename, trigger_type):
         "trigger": trigger_type,
         "timestamp": timestamp
     }
-    append_to_log(log_entry)
+    return append_to_log(log_entry)
 
 def append_to_log(entry):
     """
     Appends a generic log entry to the store.
     """
-    LOG_STORE.append(entry)
-    return entry
+    return _record(entry)
 
 def logEntry(message, tag="note"):
     """
@@ -75,16 +111,16 @@ def logEntry(message, tag="note"):
         "tag": tag,
         "message": message
     }
-    LOG_STORE.append(entry)
-    return entry
+    return _record(entry)
 
-def log_protocol_trace(module, trigger, context=None, escalation_path=None):
+def log_protocol_trace(module, trigger, context=None, escalation_path=None, user=None):
     """
     Logs a structured trace of a protocol decision path.
     module: name of the module (e.g., 'referToHuman')
     trigger: reason or signal that initiated the trace
     context: optional dictionary of emotional, editorial, or persona metadata
     escalation_path: optional list of modules or actions taken
+    user: optional username, indexed for audit queries
     """
     entry = {
         "timestamp": datetime.datetime.utcnow().isoformat(),
@@ -94,5 +130,6 @@ def log_protocol_trace(module, trigger, context=None, escalation_path=None):
         "context": context or {},
         "path": escalation_path or []
     }
-    LOG_STORE.append(entry)
-    return entry
+    if user is not None:
+        entry["user"] = user
+    return _record(entry)
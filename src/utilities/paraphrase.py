@@ -11,14 +11,18 @@ Drafted collaboratively with Bob Greenwade and Copilot.
 import os
 import glob
 import json
-import requests
+import threading
+import time
+import atexit
+import asyncio
+import random
+import sqlite3
+from datetime import datetime
+from collections import deque
+from cache import VariantCache, save_warm_file, load_warm_file
 from learning import run_learning
-
-CONFIG_PATH = "config.json"
-
-def load_config():
-    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-        return json.load(f)
+from config import load_config, subscribe_config
+from llm import get_llm_client
 
 def resolve_persona_files(persona_name):
     config = load_config()
@@ -33,8 +37,7 @@ def resolve_persona_files(persona_name):
 
     return persona_files
 
-def load_persona_data(persona_name):
-    files = resolve_persona_files(persona_name)
+def read_persona_files(persona_name, files):
     data = {"name": persona_name, "sources": files, "description": ""}
 
     for file in files:
@@ -47,28 +50,214 @@ def load_persona_data(persona_name):
 
     return data
 
-def scan_chat_history(persona_name):
+def compile_persona_block(persona_data):
+    """Returns the persona section of the paraphrase prompt."""
+    return f"""
+Paraphrase the following phrase in the voice of {persona_data.get('name', 'the persona')}.
+Persona description:
+{persona_data.get("description", "")}
+""".strip()
+
+# Persona cache: persona name -> {"signature", "data", "prompt_block"}
+PERSONA_CACHE = {}
+PERSONA_CACHE_LOCK = threading.Lock()
+
+def _persona_signature(files):
+    """
+    Directory mtime (catches added or removed persona files) plus mtime and size of each file.
+    Returns None if a file vanished.
+    """
+    base_path = load_config()["persona_resolution"]["base_path"]
+    try:
+        signature = [os.stat(base_path).st_mtime_ns] if os.path.isdir(base_path) else [None]
+        for file in files:
+            st = os.stat(file)
+            signature.append((file, st.st_mtime_ns, st.st_size))
+    except OSError:
+        return None
+    return tuple(signature)
+
+def get_persona(persona_name):
+    """
+    Returns the cached persona entry ({"data", "prompt_block"}), re-reading the persona's files
+    only when the persona directory or one of its files has changed.
+    """
+    entry = PERSONA_CACHE.get(persona_name)
+    if entry is not None and _persona_signature(entry["data"]["sources"]) == entry["signature"]:
+        return entry
+
+    files = resolve_persona_files(persona_name)
+    signature = _persona_signature(files)
+    data = read_persona_files(persona_name, files)
+    entry = {
+        "signature": signature,
+        "data": data,
+        "prompt_block": compile_persona_block(data)
+    }
+    with PERSONA_CACHE_LOCK:
+        PERSONA_CACHE[persona_name] = entry
+    return entry
+
+def load_persona_data(persona_name):
+    """Returns persona data from the persona cache (shared; treat as read-only)."""
+    return get_persona(persona_name)["data"]
+
+def preload_personas():
+    """
+    Loads every persona found under persona_resolution.base_path into the cache.
+    Returns the number of personas loaded.
+    """
     config = load_config()
-    path = config["chat_history"]["path"]
-    pattern = config["chat_history"]["filename_pattern"].replace("{persona}", persona_name)
-    full_path = os.path.join(path, pattern)
-    limit = config["chat_history"]["scan_limit"]
+    base_path = config["persona_resolution"]["base_path"]
+    names = set()
+    for pattern in config["persona_resolution"]["file_patterns"]:
+        for path in glob.glob(os.path.join(base_path, f"*.{pattern.split('.')[-1]}")):
+            names.add(os.path.basename(path).split(".")[0])
+
+    for name in sorted(names):
+        try:
+            get_persona(name)
+        except Exception as e:
+            print(f"[PARAPHRASE] Could not preload persona {name}: {e}")
+    return len(PERSONA_CACHE)
+
+def clear_persona_cache(config=None, previous=None):
+    with PERSONA_CACHE_LOCK:
+        PERSONA_CACHE.clear()
+
+# Persona paths come from config; start fresh if it changes
+subscribe_config(clear_persona_cache)
 
-    if not os.path.exists(full_path):
+def tail_lines(path, limit, block_size=8192):
+    """
+    Returns the last limit lines of a file (like f.readlines()[-limit:]) by reading
+    fixed-size blocks backward from the end, so only the tail of the file is touched.
+    """
+    if limit <= 0:
         return []
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+        # One extra newline is needed to know the oldest kept line is complete
+        while position > 0 and data.count(b"\n") <= limit:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            data = f.read(read_size) + data
+    lines = data.decode("utf-8", errors="replace").splitlines(keepends=True)
+    return lines[-limit:]
+
+class ChatHistoryTail:
+    """
+    Ring buffer of the most recent lines of one persona's chat log.
+    The first refresh tails the file; later refreshes read only bytes appended since then,
+    and re-tail if the file was rotated (new inode) or truncated.
+    """
+
+    def __init__(self, path, limit, check_interval=1.0):
+        self.path = path
+        self.limit = limit
+        self.check_interval = check_interval
+        self.lines = deque(maxlen=limit)
+        self.partial = ""  # Trailing text not yet ended by a newline
+        self.offset = 0
+        self.inode = None
+        self._last_check = None
+        self._lock = threading.Lock()
+        self.disk_reads = 0
+
+    def _retail(self, st):
+        lines = tail_lines(self.path, self.limit + 1)
+        self.lines.clear()
+        self.partial = ""
+        if lines and not lines[-1].endswith(("\n", "\r")):
+            self.partial = lines.pop()
+        self.lines.extend(lines[-self.limit:])
+        self.offset = st.st_size
+        self.inode = st.st_ino
+
+    def _read_appended(self, st):
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(st.st_size - self.offset)
+        self.offset += len(data)
+        text = self.partial + data.decode("utf-8", errors="replace")
+        lines = text.splitlines(keepends=True)
+        self.partial = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+        self.lines.extend(lines)
+
+    def refresh(self):
+        """Brings the buffer up to date with the file (at most once per check_interval)."""
+        now = time.monotonic()
+        if self._last_check is not None and now - self._last_check < self.check_interval:
+            return
+        with self._lock:
+            self._last_check = now
+            try:
+                st = os.stat(self.path)
+            except OSError:
+                self.lines.clear()
+                self.partial = ""
+                self.offset, self.inode = 0, None
+                return
+            if st.st_ino != self.inode or st.st_size < self.offset:
+                self._retail(st)
+                self.disk_reads += 1
+            elif st.st_size > self.offset:
+                self._read_appended(st)
+                self.disk_reads += 1
 
-    with open(full_path, "r", encoding="utf-8") as f:
-        lines = f.readlines()[-limit:]
-    return lines
+    def recent(self):
+        """Returns the last limit lines, in file order."""
+        self.refresh()
+        with self._lock:
+            lines = list(self.lines)
+            if self.partial:
+                lines.append(self.partial)
+        return lines[-self.limit:]
 
-def build_prompt(text, persona_data, tone, style, history_lines):
-    persona_desc = persona_data.get("description", "")
+# Per-persona chat log tails: full path -> ChatHistoryTail
+HISTORY_TAILS = {}
+HISTORY_TAILS_LOCK = threading.Lock()
+
+def get_history_tail(persona_name):
+    config = load_config()
+    history = config["chat_history"]
+    full_path = os.path.join(history["path"], history["filename_pattern"].replace("{persona}", persona_name))
+    tail = HISTORY_TAILS.get(full_path)
+    if tail is None:
+        with HISTORY_TAILS_LOCK:
+            tail = HISTORY_TAILS.get(full_path)
+            if tail is None:
+                tail = HISTORY_TAILS[full_path] = ChatHistoryTail(
+                    full_path,
+                    history["scan_limit"],
+                    history.get("check_interval", 1.0)
+                )
+    return tail
+
+def clear_history_tails(config=None, previous=None):
+    with HISTORY_TAILS_LOCK:
+        HISTORY_TAILS.clear()
+
+# scan_limit and paths come from config; start fresh if it changes
+subscribe_config(clear_history_tails)
+
+def scan_chat_history(persona_name):
+    """
+    Returns the persona's most recent chat log lines from its in-memory ring buffer,
+    reading only newly appended bytes (or the file's tail) from disk.
+    """
+    return get_history_tail(persona_name).recent()
+
+def build_prompt(text, persona_data, tone, style, history_lines, persona_block=None):
+    if persona_block is None:
+        persona_block = compile_persona_block(persona_data)
     history_excerpt = "\n".join(history_lines)
 
     return f"""
-Paraphrase the following phrase in the voice of {persona_data.get('name', 'the persona')}.
-Persona description:
-{persona_desc}
+{persona_block}
 
 Recent voice examples:
 {history_excerpt}
@@ -80,24 +269,14 @@ Paraphrased:
 """.strip()
 
 def call_llm(prompt):
-    config = load_config()
-    endpoint = config["llm"]["endpoint"]
-    payload = {
-        "model": config["llm"]["model"],
-        "temperature": config["llm"]["temperature"],
-        "prompt": prompt
-    }
+    return get_llm_client().complete(prompt)
 
-    try:
-        response = requests.post(endpoint, json=payload)
-        response.raise_for_status()
-        return response.json().get("paraphrased", "").strip()
-    except Exception as e:
-        print(f"LLM call failed: {e}")
-        return None
+async def call_llm_async(prompt):
+    return await get_llm_client().complete_async(prompt)
 
-def paraphrase(text, persona="default", tone=None, style=None):
-    persona_data = load_persona_data(persona)
+def build_paraphrase_prompt(text, persona="default", tone=None, style=None):
+    persona_entry = get_persona(persona)
+    persona_data = persona_entry["data"]
     history_lines = scan_chat_history(persona)
 
     # Optional ML tone/style refinement
@@ -113,15 +292,222 @@ def paraphrase(text, persona="default", tone=None, style=None):
     except Exception:
         pass
 
-    prompt = build_prompt(text, persona_data, tone, style, history_lines)
+    return build_prompt(text, persona_data, tone, style, history_lines, persona_entry["prompt_block"])
+
+# Paraphrase cache: up to `variants` LLM results per (text, persona, tone, style, history fingerprint)
+PARAPHRASE_CACHE_DEFAULTS = {
+    "enabled": True,
+    "variants": 3,
+    "maxsize": 4096,
+    "ttl": 86400,
+    "history_lines": 10,
+    "persist_path": None
+}
+
+def paraphrase_cache_settings(config=None):
+    config = config if config is not None else load_config()
+    return {**PARAPHRASE_CACHE_DEFAULTS, **config.get("paraphrase_cache", {})}
+
+_settings = paraphrase_cache_settings()
+PARAPHRASE_CACHE = VariantCache(
+    "paraphrase",
+    variants=_settings["variants"],
+    maxsize=_settings["maxsize"],
+    ttl=_settings["ttl"],
+    enabled=_settings["enabled"]
+)
+
+def paraphrase_cache_key(text, persona, tone, style):
+    """
+    Cache key for a paraphrase request. The last history_lines lines of the persona's chat log
+    are fingerprinted so the voice examples in the prompt are part of the key (0 = ignore history).
+    """
+    history_lines = paraphrase_cache_settings()["history_lines"]
+    history = scan_chat_history(persona)[-history_lines:] if history_lines else []
+    return PARAPHRASE_CACHE.key(text, persona, tone, style, history)
+
+def save_paraphrase_cache(path=None):
+    path = path or paraphrase_cache_settings()["persist_path"]
+    if not path:
+        return 0
+    return save_warm_file(path, {"paraphrase": PARAPHRASE_CACHE.snapshot()})
+
+def load_paraphrase_cache(path=None):
+    path = path or paraphrase_cache_settings()["persist_path"]
+    if not path:
+        return 0
+    return PARAPHRASE_CACHE.warm(load_warm_file(path).get("paraphrase", {}))
+
+def get_paraphrase_cache_stats():
+    return PARAPHRASE_CACHE.stats()
+
+# Optional persistence across restarts
+if _settings["persist_path"]:
+    load_paraphrase_cache()
+    atexit.register(save_paraphrase_cache)
+
+# Offline-precomputed paraphrases (see standalone/precomputeParaphrases.py)
+PRECOMPUTED_SCHEMA = """
+CREATE TABLE IF NOT EXISTS paraphrases (
+    text TEXT NOT NULL,
+    persona TEXT NOT NULL,
+    tone TEXT NOT NULL,
+    style TEXT NOT NULL,
+    variant INTEGER NOT NULL,
+    paraphrased TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (text, persona, tone, style, variant)
+);
+"""
+
+def write_precomputed(path, rows):
+    """
+    Upserts (text, persona, tone, style, variant, paraphrased) rows into the artifact at path.
+    tone and style may be None (stored as ""). Returns the number of rows written.
+    """
+    conn = sqlite3.connect(path)
+    try:
+        conn.executescript(PRECOMPUTED_SCHEMA)
+        now = datetime.utcnow().isoformat()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO paraphrases VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(text, persona, tone or "", style or "", variant, paraphrased, now)
+                 for text, persona, tone, style, variant, paraphrased in rows]
+            )
+    finally:
+        conn.close()
+    return len(rows)
+
+class PrecomputedParaphrases:
+    """
+    Read side of the precomputed paraphrase artifact.
+    Loads the whole table into memory on first use and again whenever the file changes
+    (checked at most every check_interval seconds). Missing file = no lookups.
+    """
+
+    def __init__(self, path, check_interval=5.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._table = {}
+        self._signature = None
+        self._last_check = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self._last_check is not None and now - self._last_check < self.check_interval:
+            return
+        with self._lock:
+            self._last_check = now
+            try:
+                st = os.stat(self.path) if self.path else None
+            except OSError:
+                st = None
+            signature = (st.st_mtime_ns, st.st_size) if st else None
+            if signature == self._signature:
+                return
+            table = {}
+            if st:
+                try:
+                    conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+                    try:
+                        rows = conn.execute(
+                            "SELECT text, persona, tone, style, paraphrased FROM paraphrases ORDER BY variant"
+                        ).fetchall()
+                    finally:
+                        conn.close()
+                    for text, persona, tone, style, paraphrased in rows:
+                        table.setdefault((text, persona, tone, style), []).append(paraphrased)
+                except Exception as e:
+                    print(f"[PARAPHRASE] Could not load precomputed paraphrases from {self.path}: {e}")
+            self._table = table
+            self._signature = signature
+
+    def get(self, text, persona, tone=None, style=None):
+        """Returns a precomputed paraphrase (an exact style match first, then any style), or None."""
+        self._refresh()
+        variants = (
+            self._table.get((text, persona, tone or "", style or ""))
+            or self._table.get((text, persona, tone or "", ""))
+        )
+        if not variants:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return random.choice(variants)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "entries": len(self._table),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+def precomputed_settings(config=None):
+    config = config if config is not None else load_config()
+    return {"path": "paraphrases.db", "check_interval": 5.0, **config.get("paraphrase_precomputed", {})}
+
+PRECOMPUTED_PARAPHRASES = PrecomputedParaphrases(**precomputed_settings())
+
+def _on_config_reload(config, previous):
+    precomputed = precomputed_settings(config)
+    PRECOMPUTED_PARAPHRASES.path = precomputed["path"]
+    PRECOMPUTED_PARAPHRASES.check_interval = precomputed["check_interval"]
+    PRECOMPUTED_PARAPHRASES._last_check = None
+
+    settings = paraphrase_cache_settings(config)
+    PARAPHRASE_CACHE.configure(
+        enabled=settings["enabled"],
+        variants=settings["variants"],
+        maxsize=settings["maxsize"],
+        ttl=settings["ttl"]
+    )
+
+subscribe_config(_on_config_reload)
+
+def paraphrase(text, persona="default", tone=None, style=None):
+    precomputed = PRECOMPUTED_PARAPHRASES.get(text, persona, tone, style)
+    if precomputed is not None:
+        return precomputed
+
+    key = paraphrase_cache_key(text, persona, tone, style)
+    cached = PARAPHRASE_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    prompt = build_paraphrase_prompt(text, persona, tone, style)
     result = call_llm(prompt)
+    if result:
+        PARAPHRASE_CACHE.add(key, result)
     return result or text  # fallback to original if LLM fails
 
-def reparaphrase(text, persona="default", tone=None, style=None, previous_attempt=None, variation_tag="semantic_shift"):
+async def paraphrase_async(text, persona="default", tone=None, style=None):
     """
-    Refines or rephrases a prior paraphrase attempt based on editorial feedback.
-    Uses variation_tag to signal desired change (e.g., 'semantic_shift', 'tone_flip', 'clarity_boost').
+    Async paraphrase(): prompt assembly runs in a worker thread and the LLM call shares
+    the client's concurrency limit, so many protocols can paraphrase at once.
     """
+    precomputed = PRECOMPUTED_PARAPHRASES.get(text, persona, tone, style)
+    if precomputed is not None:
+        return precomputed
+
+    key = await asyncio.to_thread(paraphrase_cache_key, text, persona, tone, style)
+    cached = PARAPHRASE_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    prompt = await asyncio.to_thread(build_paraphrase_prompt, text, persona, tone, style)
+    result = await call_llm_async(prompt)
+    if result:
+        PARAPHRASE_CACHE.add(key, result)
+    return result or text
+
+def build_reparaphrase_prompt(text, persona="default", tone=None, style=None, previous_attempt=None, variation_tag="semantic_shift"):
     persona_data = load_persona_data(persona)
     history_lines = scan_chat_history(persona)
 
@@ -151,5 +537,21 @@ Previous attempt: "{previous_attempt}"
 New version:
 """.strip()
 
+    return prompt
+
+def reparaphrase(text, persona="default", tone=None, style=None, previous_attempt=None, variation_tag="semantic_shift"):
+    """
+    Refines or rephrases a prior paraphrase attempt based on editorial feedback.
+    Uses variation_tag to signal desired change (e.g., 'semantic_shift', 'tone_flip', 'clarity_boost').
+    """
+    prompt = build_reparaphrase_prompt(text, persona, tone, style, previous_attempt, variation_tag)
     result = call_llm(prompt)
     return result or text
+
+async def reparaphrase_async(text, persona="default", tone=None, style=None, previous_attempt=None, variation_tag="semantic_shift"):
+    """Async reparaphrase(); see paraphrase_async()."""
+    prompt = await asyncio.to_thread(
+        build_reparaphrase_prompt, text, persona, tone, style, previous_attempt, variation_tag
+    )
+    result = await call_llm_async(prompt)
+    return result or text
@@ -2,47 +2,571 @@
 profile.py — Modular user profile management for DLI
 
 Supports creation, updates, editorial assertions, and ML-based trait refinement.
+Parsed profiles are kept in memory by a ProfileStore and written back in batches (write-behind)
+to a pluggable backend: one JSON file per user (default) or an indexed SQLite database.
+Updates to one profile are serialized by per-user locks (plus file locks in process-safe mode).
 Drafted collaboratively with Bob Greenwade and Copilot.
 """
 
 import os
 import json
+import copy
+import atexit
+import sqlite3
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
 from embedding import fetch_external_profile
 from learning import run_learning
+from config import load_config
+
+try:
+    import fcntl  # POSIX only; used for cross-process profile locks
+except ImportError:
+    fcntl = None
 
-CONFIG_PATH = "config.json"
 PROFILE_DIR = "profiles"
 
-def load_config():
-    try:
-        with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+def get_profile_path(username):
+    return os.path.join(PROFILE_DIR, f"{username}_profile.json")
+
+class JSONProfileBackend:
+    """
+    One JSON file per user under profile_dir (the original layout).
+    Every change rewrites the user's whole document, atomically (temp file + rename).
+    """
+
+    name = "json"
+
+    def __init__(self, profile_dir=PROFILE_DIR):
+        self.profile_dir = profile_dir
+        self.lock_dir = os.path.join(profile_dir, ".locks")
+
+    def path(self, username):
+        return os.path.join(self.profile_dir, f"{username}_profile.json")
+
+    def load(self, username):
+        path = self.path(username)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
             return json.load(f)
-    except Exception:
-        return {}
 
-CONFIG = load_config()
+    def save(self, username, profile):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.profile_dir, prefix=f".{username}_", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(profile, f, indent=2)
+            os.replace(tmp_path, self.path(username))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
 
-def get_profile_path(username):
-    return os.path.join(PROFILE_DIR, f"{username}_profile.json")
+    def apply(self, username, ops, profile):
+        """Persists queued changes; a document store can only rewrite the whole profile."""
+        self.save(username, profile)
+
+    def list_users(self):
+        if not os.path.isdir(self.profile_dir):
+            return []
+        suffix = "_profile.json"
+        return sorted(name[:-len(suffix)] for name in os.listdir(self.profile_dir) if name.endswith(suffix))
+
+    def close(self):
+        pass
+
+# Profile sections stored as indexed rows by the SQLite backend
+ROW_SECTIONS = {
+    "profile_characteristics": "characteristics",
+    "facts": "facts"
+}
+
+class SQLiteProfileBackend:
+    """
+    Profiles in one SQLite database. Characteristics and facts are keyed rows and assertions are
+    appended rows, so single-field changes become one-row upserts or inserts instead of document rewrites.
+    The remaining profile fields are kept as one JSON document per user.
+    """
+
+    name = "sqlite"
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS profiles (
+        username TEXT PRIMARY KEY,
+        document TEXT NOT NULL,
+        updated_at TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS characteristics (
+        username TEXT NOT NULL,
+        key TEXT NOT NULL,
+        value TEXT NOT NULL,
+        PRIMARY KEY (username, key)
+    );
+    CREATE TABLE IF NOT EXISTS facts (
+        username TEXT NOT NULL,
+        key TEXT NOT NULL,
+        value TEXT NOT NULL,
+        PRIMARY KEY (username, key)
+    );
+    CREATE TABLE IF NOT EXISTS assertions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT NOT NULL,
+        assertion TEXT NOT NULL,
+        created_at TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_assertions_username ON assertions (username, id);
+    CREATE INDEX IF NOT EXISTS idx_characteristics_key ON characteristics (key);
+    CREATE INDEX IF NOT EXISTS idx_facts_key ON facts (key);
+    """
+
+    def __init__(self, db_path="profiles/profiles.db"):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        self.lock_dir = os.path.join(directory, ".locks")
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        self._lock = threading.Lock()
+
+    def load(self, username):
+        with self._lock:
+            row = self._conn.execute("SELECT document FROM profiles WHERE username = ?", (username,)).fetchone()
+            if row is None:
+                return None
+            profile = json.loads(row[0])
+            for section, table in ROW_SECTIONS.items():
+                rows = self._conn.execute(f"SELECT key, value FROM {table} WHERE username = ?", (username,))
+                profile[section] = {key: json.loads(value) for key, value in rows}
+            rows = self._conn.execute("SELECT assertion FROM assertions WHERE username = ? ORDER BY id", (username,))
+            profile["assertions"] = [json.loads(value) for (value,) in rows]
+        return profile
+
+    def _write_document(self, username, profile):
+        document = {k: v for k, v in profile.items() if k not in ROW_SECTIONS and k != "assertions"}
+        self._conn.execute(
+            "INSERT INTO profiles (username, document, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(username) DO UPDATE SET document = excluded.document, updated_at = excluded.updated_at",
+            (username, json.dumps(document), datetime.utcnow().isoformat())
+        )
+
+    def _upsert(self, table, username, key, value):
+        self._conn.execute(
+            f"INSERT INTO {table} (username, key, value) VALUES (?, ?, ?) "
+            "ON CONFLICT(username, key) DO UPDATE SET value = excluded.value",
+            (username, key, json.dumps(value))
+        )
+
+    def _append_assertion(self, username, assertion):
+        self._conn.execute(
+            "INSERT INTO assertions (username, assertion, created_at) VALUES (?, ?, ?)",
+            (username, json.dumps(assertion), datetime.utcnow().isoformat())
+        )
+
+    def _replace(self, username, profile):
+        self._write_document(username, profile)
+        for section, table in ROW_SECTIONS.items():
+            self._conn.execute(f"DELETE FROM {table} WHERE username = ?", (username,))
+            for key, value in profile.get(section, {}).items():
+                self._upsert(table, username, key, value)
+        self._conn.execute("DELETE FROM assertions WHERE username = ?", (username,))
+        for assertion in profile.get("assertions", []):
+            self._append_assertion(username, assertion)
+
+    def save(self, username, profile):
+        with self._lock, self._conn:
+            self._replace(username, profile)
+
+    def save_many(self, profiles):
+        """Saves {username: profile} in one transaction (used for bulk imports)."""
+        with self._lock, self._conn:
+            for username, profile in profiles.items():
+                self._replace(username, profile)
+
+    def apply(self, username, ops, profile):
+        """
+        Persists queued changes in one transaction.
+        ops: list of ("characteristic", key, value), ("fact", key, value), ("assertion", value),
+        ("document",) or ("replace",); any "replace" falls back to a full save of profile.
+        """
+        with self._lock, self._conn:
+            if any(op[0] == "replace" for op in ops):
+                self._replace(username, profile)
+                return
+            for op in ops:
+                if op[0] == "characteristic":
+                    self._upsert("characteristics", username, op[1], op[2])
+                elif op[0] == "fact":
+                    self._upsert("facts", username, op[1], op[2])
+                elif op[0] == "assertion":
+                    self._append_assertion(username, op[1])
+                elif op[0] == "document":
+                    self._write_document(username, profile)
+
+    def list_users(self):
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT username FROM profiles ORDER BY username")]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+PROFILE_BACKENDS = {
+    "json": lambda config: JSONProfileBackend(config.get("PROFILE_DIR", PROFILE_DIR)),
+    "sqlite": lambda config: SQLiteProfileBackend(config.get("PROFILE_DB_PATH", os.path.join(PROFILE_DIR, "profiles.db")))
+}
+
+def create_profile_backend(name=None, config=None):
+    """
+    Returns a profile backend by name ("json" or "sqlite"), defaulting to PROFILE_BACKEND in config.json.
+    """
+    config = load_config() if config is None else config
+    name = name or config.get("PROFILE_BACKEND", "json")
+    if name not in PROFILE_BACKENDS:
+        print(f"[PROFILE] Unknown profile backend '{name}', using json")
+        name = "json"
+    return PROFILE_BACKENDS[name](config)
+
+class ProfileStore:
+    """
+    In-memory cache of parsed user profiles with write-behind persistence.
+    Reads are served from memory after the first load; each change queues an operation for its user,
+    and queued operations are handed to the backend in batches every flush_interval seconds and at shutdown.
+    Read-modify-write on one profile is serialized by a per-user lock.
+    backend: JSONProfileBackend, SQLiteProfileBackend, or any object with load/save/apply/list_users
+    flush_interval: seconds between background flushes (0 = write through on every change)
+    max_cached: clean profiles kept in memory before the least recently used are dropped
+    process_safe: for several worker processes sharing one profile store; every change takes an
+    fcntl file lock for its user, re-reads the profile, and writes through before releasing it
+    """
+
+    def __init__(self, backend=None, flush_interval=2.0, max_cached=1024, process_safe=False):
+        self.backend = backend or JSONProfileBackend()
+        self.flush_interval = flush_interval
+        self.max_cached = max_cached
+        self.process_safe = process_safe
+        if process_safe and fcntl is None:
+            print("[PROFILE] fcntl not available; process-safe mode falls back to in-process locks")
+        self._profiles = OrderedDict()
+        self._pending = {}  # username -> queued operations
+        self._lock = threading.RLock()  # Guards the cache and queue; profile contents use per-user locks
+        self._user_locks = {}
+        self._file_locks = {}  # username -> [file descriptor, depth]
+        self._flush_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.loads = 0
+        self.writes = 0
+        self.flushes = 0
+        self.conflicts = 0
+
+    def _user_lock(self, username):
+        with self._lock:
+            lock = self._user_locks.get(username)
+            if lock is None:
+                lock = self._user_locks[username] = threading.RLock()
+            return lock
+
+    @contextmanager
+    def lock_user(self, username):
+        """
+        Holds the user's in-process lock and, in process-safe mode, an exclusive file lock
+        so no other thread or worker process modifies the profile meanwhile. Re-entrant.
+        """
+        with self._user_lock(username):
+            if not self.process_safe or fcntl is None:
+                yield
+                return
+            entry = self._file_locks.get(username)
+            if entry is None:
+                lock_dir = getattr(self.backend, "lock_dir", ".locks")
+                os.makedirs(lock_dir, exist_ok=True)
+                fd = os.open(os.path.join(lock_dir, f"{username}.lock"), os.O_RDWR | os.O_CREAT, 0o644)
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                except Exception:
+                    os.close(fd)
+                    raise
+                entry = self._file_locks[username] = [fd, 0]
+            entry[1] += 1
+            try:
+                yield
+            finally:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._file_locks[username]
+                    fcntl.flock(entry[0], fcntl.LOCK_UN)
+                    os.close(entry[0])
+
+    def _load(self, username, fresh=False):
+        """
+        Returns the cached profile dictionary (not a copy), reading it from the backend on first use
+        (or always, when fresh). Caller holds the user's lock.
+        """
+        with self._lock:
+            profile = self._profiles.get(username)
+            if profile is not None and not fresh:
+                self._profiles.move_to_end(username)
+                return profile
+        profile = self.backend.load(username)
+        with self._lock:
+            if profile is None:
+                self._profiles.pop(username, None)
+                return None
+            self.loads += 1
+            self._profiles[username] = profile
+            self._evict()
+        return profile
+
+    def exists(self, username):
+        with self._user_lock(username):
+            return self._load(username, fresh=self.process_safe) is not None
+
+    def get(self, username):
+        """Returns a copy of the profile, or None if the user has no profile."""
+        with self._user_lock(username):
+            profile = self._load(username, fresh=self.process_safe)
+            return copy.deepcopy(profile) if profile is not None else None
+
+    def read(self, username, fn, default=None):
+        """
+        Returns fn(profile) without copying the profile; fn must not modify it.
+        Returns default if the user has no profile.
+        """
+        with self._user_lock(username):
+            profile = self._load(username, fresh=self.process_safe)
+            return fn(profile) if profile is not None else default
+
+    def put(self, username, profile):
+        """Stores a whole profile, replacing any existing one."""
+        with self.lock_user(username):
+            self._store(username, profile)
+        self._schedule_write()
+
+    def put_if_absent(self, username, profile):
+        """
+        Stores a newly created profile unless the user already has one (created meanwhile by another
+        thread or worker process). Returns True if the profile was stored.
+        """
+        with self.lock_user(username):
+            if self._load(username, fresh=self.process_safe) is not None:
+                return False
+            self._store(username, profile)
+        self._schedule_write()
+        return True
+
+    def _store(self, username, profile):
+        # Caller holds the user's lock
+        with self._lock:
+            self._profiles[username] = profile
+            self._profiles.move_to_end(username)
+            self._pending[username] = [("replace",)]
+        if self.process_safe:
+            self._flush_user(username)
+
+    def modify(self, username, fn):
+        """
+        Locked read-modify-write. fn(profile) changes the profile in place and returns (result, op),
+        where op describes the change for the backend (see SQLiteProfileBackend.apply) or is None
+        if nothing changed. Returns result, or None if the user has no profile.
+        """
+        with self.lock_user(username):
+            profile = self._load(username, fresh=self.process_safe)
+            if profile is None:
+                return None
+            result, op = fn(profile)
+            if op is not None:
+                with self._lock:
+                    self._profiles[username] = profile  # Keep it cached even if evicted meanwhile
+                    self._pending.setdefault(username, []).append(copy.deepcopy(op))
+                if self.process_safe:
+                    self._flush_user(username)
+        if op is not None:
+            self._schedule_write()
+        return result
+
+    def update(self, username, fn, op=("replace",)):
+        """
+        Applies fn(profile) to the profile in place under the user's lock and queues op for the backend.
+        The default op rewrites the whole profile.
+        Returns fn's result, or None if the user has no profile.
+        """
+        return self.modify(username, lambda profile: (fn(profile), op))
+
+    def compare_and_set(self, username, path, expected, value):
+        """
+        Sets the field at path (e.g., ("profile_characteristics", "concern_level")) to value only if it
+        currently equals expected. Returns True if the value was set, False on a conflict or missing profile.
+        """
+        def swap(profile):
+            parent = profile
+            for key in path[:-1]:
+                parent = parent.setdefault(key, {})
+            if parent.get(path[-1]) != expected:
+                return False, None
+            parent[path[-1]] = value
+            return True, op_for_path(path, value)
+
+        swapped = bool(self.modify(username, swap))
+        if not swapped:
+            self.conflicts += 1
+        return swapped
+
+    def _schedule_write(self):
+        # Called outside the locks: flush() takes _flush_lock and user locks before _lock
+        if self.process_safe:
+            return
+        if not self.flush_interval:
+            self.flush()
+        else:
+            self.start()
+
+    def _evict(self):
+        # Only clean profiles are dropped; profiles with queued changes stay until flushed
+        for username in list(self._profiles):
+            if len(self._profiles) <= self.max_cached:
+                break
+            if username not in self._pending:
+                del self._profiles[username]
+
+    def invalidate(self, username=None):
+        """Drops clean cached profiles so they are re-read from the backend (e.g., after an external edit)."""
+        with self._lock:
+            names = [username] if username else list(self._profiles)
+            for name in names:
+                if name not in self._pending:
+                    self._profiles.pop(name, None)
+
+    def _flush_user(self, username):
+        """Hands one user's queued changes to the backend. Returns True if anything was written."""
+        with self._user_lock(username):
+            with self._lock:
+                ops = self._pending.pop(username, None)
+                profile = self._profiles.get(username)
+                if not ops or profile is None:
+                    return False
+                profile = copy.deepcopy(profile)
+            try:
+                self.backend.apply(username, ops, profile)
+            except Exception as e:
+                print(f"[PROFILE] Could not write profile for {username}: {e}")
+                with self._lock:
+                    self._pending[username] = ops + self._pending.get(username, [])
+                return False
+        return True
+
+    def flush(self):
+        """Hands every queued change to the backend. Returns the number of profiles written."""
+        with self._flush_lock:
+            with self._lock:
+                usernames = list(self._pending)
+            written = sum(1 for username in usernames if self._flush_user(username))
+            with self._lock:
+                if written:
+                    self.flushes += 1
+                    self.writes += written
+                self._evict()
+            return written
+
+    def start(self):
+        """Starts the background flush thread (called automatically on the first change)."""
+        if self._thread is None and self.flush_interval:
+            with self._lock:
+                if self._thread is None:
+                    self._stop_event.clear()
+                    self._thread = threading.Thread(target=self._run, name="dli-profile-flush", daemon=True)
+                    self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
+
+    def stop(self):
+        """Stops the flush thread and writes anything still pending."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": getattr(self.backend, "name", type(self.backend).__name__),
+                "process_safe": self.process_safe,
+                "cached": len(self._profiles),
+                "dirty": len(self._pending),
+                "loads": self.loads,
+                "writes": self.writes,
+                "flushes": self.flushes,
+                "conflicts": self.conflicts,
+                "flush_interval": self.flush_interval
+            }
+
+def op_for_path(path, value):
+    """Returns the backend operation for setting the profile field at path."""
+    if len(path) == 2 and path[0] == "profile_characteristics":
+        return ("characteristic", path[1], value)
+    if len(path) == 2 and path[0] == "facts":
+        return ("fact", path[1], value)
+    if path[0] not in ROW_SECTIONS and path[0] != "assertions":
+        return ("document",)
+    return ("replace",)
+
+PROFILE_STORE = ProfileStore(
+    backend=create_profile_backend(),
+    flush_interval=load_config().get("PROFILE_FLUSH_INTERVAL", 2.0),
+    process_safe=load_config().get("PROFILE_PROCESS_SAFE", False)
+)
+atexit.register(PROFILE_STORE.stop)
+
+def flush_profiles():
+    """Writes pending profile changes now (e.g., before handing files to another process)."""
+    return PROFILE_STORE.flush()
+
+def modify_profile(username, fn, op=("replace",)):
+    """
+    Locked read-modify-write of a user's profile: fn(profile) changes it in place.
+    Returns fn's result, or None if the user has no profile.
+    """
+    return PROFILE_STORE.update(username, fn, op=op)
+
+def compare_and_set_characteristic(username, key, expected, value):
+    """Sets a characteristic only if it still equals expected. Returns True on success."""
+    return PROFILE_STORE.compare_and_set(username, ("profile_characteristics", key), expected, value)
+
+def increment_characteristic(username, key, delta=1):
+    """Atomically adds delta to a numeric characteristic. Returns the new value."""
+    def increment(profile):
+        characteristics = profile.setdefault("profile_characteristics", {})
+        characteristics[key] = characteristics.get(key, 0) + delta
+        return characteristics[key], ("characteristic", key, characteristics[key])
+
+    if not PROFILE_STORE.exists(username):
+        create_user_profile(username)
+    return PROFILE_STORE.modify(username, increment)
 
 def get_user_profile(username="User"):
-    path = get_profile_path(username)
-    if not os.path.exists(path):
+    if not PROFILE_STORE.exists(username):
         print(f"[PROFILE] No profile found for {username}, creating...")
         create_user_profile(username)
 
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return PROFILE_STORE.get(username)
 
 def create_user_profile(username, seed_text="Hello, I’m new here."):
-    os.makedirs(PROFILE_DIR, exist_ok=True)
-    path = get_profile_path(username)
-
-    if os.path.exists(path):
+    if PROFILE_STORE.exists(username):
         print(f"[PROFILE] Profile already exists for {username}")
         return
 
-    external = fetch_external_profile(CONFIG.get("EXTERNAL_PROFILE_API", ""), seed_text)
+    # Fetched before taking the user's lock; the profile is only stored if nobody created one meanwhile
+    external = fetch_external_profile(load_config().get("EXTERNAL_PROFILE_API", ""), seed_text)
     profile = {
         "name": username,
         "preferred_language": "en-US",
@@ -64,88 +588,60 @@ def create_user_profile(username, seed_text="Hello, I’m new here."):
         "facts": {}
     }
 
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(profile, f, indent=2)
+    if not PROFILE_STORE.put_if_absent(username, profile):
+        print(f"[PROFILE] Profile already exists for {username}")
+        return
     print(f"[PROFILE] Created profile for {username}")
 
 def update_profile_seed(username, new_seed_text):
-    path = get_profile_path(username)
-    if not os.path.exists(path):
+    if not PROFILE_STORE.exists(username):
         print(f"[PROFILE] No profile found for {username}")
         return
 
-    external = fetch_external_profile(CONFIG.get("EXTERNAL_PROFILE_API", ""), new_seed_text)
-    with open(path, "r+", encoding="utf-8") as f:
-        profile = json.load(f)
-        profile["external_profile"] = external
-        f.seek(0)
-        json.dump(profile, f, indent=2)
-        f.truncate()
+    external = fetch_external_profile(load_config().get("EXTERNAL_PROFILE_API", ""), new_seed_text)
+    PROFILE_STORE.update(username, lambda profile: profile.update({"external_profile": external}), op=("document",))
     print(f"[PROFILE] Updated external seed for {username}")
 
 def update_user_profile(username, updates):
-    path = get_profile_path(username)
-    if not os.path.exists(path):
+    if not PROFILE_STORE.exists(username):
         print(f"[PROFILE] No profile found for {username}")
         return
 
-    with open(path, "r+", encoding="utf-8") as f:
-        profile = json.load(f)
-        profile.update(updates)
-        f.seek(0)
-        json.dump(profile, f, indent=2)
-        f.truncate()
+    PROFILE_STORE.update(username, lambda profile: profile.update(updates))
     print(f"[PROFILE] Updated profile for {username}")
 
 def profile_assertion(username, assertion):
-    path = get_profile_path(username)
-    if not os.path.exists(path):
+    if not PROFILE_STORE.exists(username):
         print(f"[PROFILE] No profile found for {username}")
         return
 
-    with open(path, "r+", encoding="utf-8") as f:
-        profile = json.load(f)
-        profile.setdefault("assertions", []).append(assertion)
-        f.seek(0)
-        json.dump(profile, f, indent=2)
-        f.truncate()
+    PROFILE_STORE.update(username, lambda profile: profile.setdefault("assertions", []).append(assertion), op=("assertion", assertion))
     print(f"[PROFILE] Assertion added for {username}")
 
 def profile_user_fact(username, key, value):
-    path = get_profile_path(username)
-    if not os.path.exists(path):
+    if not PROFILE_STORE.exists(username):
         print(f"[PROFILE] No profile found for {username}")
         return
 
-    with open(path, "r+", encoding="utf-8") as f:
-        profile = json.load(f)
-        profile.setdefault("facts", {})[key] = value
-        f.seek(0)
-        json.dump(profile, f, indent=2)
-        f.truncate()
+    PROFILE_STORE.update(username, lambda profile: profile.setdefault("facts", {}).update({key: value}), op=("fact", key, value))
     print(f"[PROFILE] Fact stored for {username}: {key} = {value}")
 
 def update_characteristic(username, key, value):
-    path = get_profile_path(username)
-    if not os.path.exists(path):
+    if not PROFILE_STORE.exists(username):
         create_user_profile(username)
 
-    with open(path, "r+", encoding="utf-8") as f:
-        profile = json.load(f)
-        profile.setdefault("profile_characteristics", {})[key] = value
-        f.seek(0)
-        json.dump(profile, f, indent=2)
-        f.truncate()
+    PROFILE_STORE.update(
+        username,
+        lambda profile: profile.setdefault("profile_characteristics", {}).update({key: value}),
+        op=("characteristic", key, value)
+    )
     print(f"[PROFILE] Updated {key} to {value} for {username}")
 
 def get_characteristic(username, key):
-    path = get_profile_path(username)
-    if not os.path.exists(path):
+    if not PROFILE_STORE.exists(username):
         create_user_profile(username)
 
-    with open(path, "r", encoding="utf-8") as f:
-        profile = json.load(f)
-        value = profile.get("profile_characteristics", {}).get(key, None)
+    value = PROFILE_STORE.read(username, lambda profile: profile.get("profile_characteristics", {}).get(key, None))
 
     # Optional ML override
     try:
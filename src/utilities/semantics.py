@@ -4,28 +4,77 @@ semantics.py — Editorial semantic matching and rhythm-aware analysis
 Provides synonym expansion, word-form normalization, semantic matching,
 phrase structure detection, euphemism flagging, and conceptual drift scoring.
 Supports emotional tone detection, confidence tagging, and reality mode classification.
+WordNet lemma and synonym lookups are cached process-wide (see cache.py).
 Drafted collaboratively with Bob Greenwade and Copilot.
 """
 
 import re
+import threading
 import nltk
 from nltk.corpus import wordnet
 from nltk.stem import WordNetLemmatizer
 from learning import run_learning
+from cache import LRUCache, save_warm_file, load_warm_file
+from automaton import PhraseAutomaton
 
 lemmatizer = WordNetLemmatizer()
 
-def normalize_word(word):
-    """Returns the base form of a word using lemmatization."""
-    return lemmatizer.lemmatize(word.lower())
+# Process-wide caches for WordNet lookups (shared by every cue list and caller)
+LEMMA_CACHE_SIZE = 20000
+SYNONYM_CACHE_SIZE = 20000
+LEMMA_CACHE = LRUCache(LEMMA_CACHE_SIZE, name="lemmas")
+SYNONYM_CACHE = LRUCache(SYNONYM_CACHE_SIZE, name="synonyms")
 
-def get_synonyms(word):
-    """Returns a set of synonyms for the given word using WordNet."""
+def _lemmatize(word):
+    return lemmatizer.lemmatize(word)
+
+def _lookup_synonyms(word):
     synonyms = set()
     for syn in wordnet.synsets(word):
         for lemma in syn.lemmas():
             synonyms.add(lemma.name().lower())
-    return synonyms
+    return frozenset(synonyms)
+
+def normalize_word(word):
+    """Returns the base form of a word using lemmatization."""
+    return LEMMA_CACHE.get_or_compute(word.lower(), _lemmatize)
+
+def get_synonyms(word):
+    """Returns a set of synonyms for the given word using WordNet."""
+    return SYNONYM_CACHE.get_or_compute(word, _lookup_synonyms)
+
+def get_semantic_cache_stats():
+    """Returns hit/miss counters for the lemma and synonym caches."""
+    return {
+        "lemmas": LEMMA_CACHE.stats(),
+        "synonyms": SYNONYM_CACHE.stats()
+    }
+
+def clear_semantic_cache():
+    """Empties the lemma and synonym caches and resets their counters."""
+    for cache in (LEMMA_CACHE, SYNONYM_CACHE):
+        cache.clear()
+        cache.reset_stats()
+
+def save_semantic_cache(path="semantic_cache.json"):
+    """
+    Writes the current lemma and synonym caches to an on-disk warm file.
+    Returns the number of entries written.
+    """
+    return save_warm_file(path, {
+        "lemmas": LEMMA_CACHE.snapshot(),
+        "synonyms": SYNONYM_CACHE.snapshot(encode=sorted)
+    })
+
+def load_semantic_cache(path="semantic_cache.json"):
+    """
+    Warms the lemma and synonym caches from a file written by save_semantic_cache().
+    Returns the number of entries loaded (0 if no warm file exists).
+    """
+    sections = load_warm_file(path)
+    count = LEMMA_CACHE.warm(sections.get("lemmas", {}))
+    count += SYNONYM_CACHE.warm(sections.get("synonyms", {}), decode=frozenset)
+    return count
 
 def match_semantic(word, target_list):
     """Returns True if word or its synonyms match any item in target_list."""
@@ -34,18 +83,137 @@ def match_semantic(word, target_list):
     expanded = synonyms.union({normalized})
     return any(t in expanded for t in target_list)
 
+# Ad hoc phrase lists passed to match_phrase() get their own compiled automaton
+PHRASE_AUTOMATA = LRUCache(256, name="phrase_automata")
+
+def find_phrase_matches(text, phrase_list):
+    """Returns the phrases in phrase_list that appear in text, in order of first appearance."""
+    automaton = PHRASE_AUTOMATA.get_or_compute(
+        tuple(phrase_list), lambda key: PhraseAutomaton({"phrases": list(key)})
+    )
+    return automaton.match(text).get("phrases", [])
+
 def match_phrase(text, phrase_list):
     """Returns True if any phrase in phrase_list appears in text."""
-    lowered = text.lower()
-    return any(phrase.lower() in lowered for phrase in phrase_list)
+    return bool(find_phrase_matches(text, phrase_list))
+
+class TriggerMatcher:
+    """
+    Compiled matcher for one or more named cue lists.
+    Matches exactly like match_semantic(): a token fires a cue when the cue is the token's lemma
+    or one of its WordNet synonyms. WordNet resolves inflections across parts of speech
+    ("hated" -> hate, "angrier" -> angry), so the expansion is done per token and cached;
+    a single tokenization pass reports which cues fired in every list.
+    Multi-word cues never match a single token and are left to match_phrase().
+    """
+
+    TOKEN_CACHE_SIZE = 20000
+
+    def __init__(self, cue_lists):
+        self.cue_lists = cue_lists
+        self._compiled = None  # (cue index, per-token match cache)
+        self._lock = threading.Lock()
+        self._listeners = []
+
+    def _compile(self):
+        index = {}
+        for name, cues in self.cue_lists.items():
+            for cue in cues:
+                if " " in cue:
+                    continue
+                fired = index.setdefault(cue, {}).setdefault(name, [])
+                if cue not in fired:
+                    fired.append(cue)
+        return index, LRUCache(self.TOKEN_CACHE_SIZE, name="trigger_tokens")
+
+    def _get_compiled(self):
+        compiled = self._compiled
+        if compiled is None:
+            with self._lock:
+                if self._compiled is None:
+                    self._compiled = self._compile()
+                compiled = self._compiled
+        return compiled
+
+    def _match_token(self, token, index):
+        normalized = normalize_word(token)
+        matches = {}
+        for form in get_synonyms(normalized).union({normalized}):
+            for name, cues in index.get(form, {}).items():
+                fired = matches.setdefault(name, [])
+                fired.extend(c for c in cues if c not in fired)
+        return matches
+
+    def match_tokens(self, tokens):
+        """
+        Returns {list_name: [matched cues]} for already-lowercased tokens.
+        Lists with no matches are omitted.
+        """
+        index, token_cache = self._get_compiled()
+        matches = {}
+        for token in tokens:
+            hits = token_cache.get_or_compute(token, lambda t: self._match_token(t, index))
+            for name, cues in hits.items():
+                fired = matches.setdefault(name, [])
+                fired.extend(c for c in cues if c not in fired)
+        return matches
+
+    def match(self, text):
+        """Returns {list_name: [matched cues]} for every cue list that fired in text."""
+        return self.match_tokens(text.lower().split())
+
+    def extend(self, name, terms):
+        """Adds terms to a cue list and recompiles on next use."""
+        self.cue_lists.setdefault(name, []).extend(terms)
+        self.invalidate()
+
+    def invalidate(self):
+        """Drops the compiled index (e.g., after cue lists change) and notifies subscribers."""
+        with self._lock:
+            self._compiled = None
+        for callback in list(self._listeners):
+            callback()
+
+    def subscribe(self, callback):
+        """Registers a zero-argument callback run whenever the cue lists change."""
+        self._listeners.append(callback)
+
+# Ad hoc wordlists passed to match_wordlist() get their own compiled matcher
+WORDLIST_MATCHERS = LRUCache(256, name="wordlist_matchers")
+
+def find_wordlist_matches(text, wordlist):
+    """Returns the words in wordlist matched (directly or via synonym) by tokens in text."""
+    matcher = WORDLIST_MATCHERS.get_or_compute(
+        tuple(wordlist), lambda key: TriggerMatcher({"wordlist": list(key)})
+    )
+    return matcher.match(text).get("wordlist", [])
 
 def match_wordlist(text, wordlist):
     """Returns True if any word or synonym in wordlist appears in text."""
-    tokens = text.lower().split()
-    for token in tokens:
-        if match_semantic(token, wordlist):
-            return True
-    return False
+    return bool(find_wordlist_matches(text, wordlist))
+
+TOPIC_STOPWORDS = {
+    "about", "after", "again", "also", "because", "been", "before", "being", "could",
+    "does", "doing", "from", "have", "having", "here", "into", "just", "like", "more",
+    "much", "only", "other", "over", "really", "same", "should", "some", "such", "than",
+    "that", "their", "them", "then", "there", "these", "they", "thing", "things", "think",
+    "this", "those", "through", "very", "want", "were", "what", "when", "where", "which",
+    "while", "will", "with", "would", "your", "yours"
+}
+
+def extract_topic_keywords(text, min_length=4):
+    """
+    Returns content-word lemmas that signal the topic of a turn, in order of first appearance.
+    Drops short words and common function words.
+    """
+    keywords = []
+    for token in re.findall(r"[a-z']+", text.lower()):
+        if len(token) < min_length or token in TOPIC_STOPWORDS:
+            continue
+        lemma = normalize_word(token)
+        if lemma not in keywords:
+            keywords.append(lemma)
+    return keywords
 
 def match_phrase_structure(text):
     """
@@ -61,16 +229,18 @@ def match_phrase_structure(text):
         "punctuation": punctuation
     }
 
+EUPHEMISM_SOFTENERS = [
+    "passed away", "let go", "downsized", "special", "unique",
+    "challenging", "differently abled", "nontraditional", "alternative"
+]
+EUPHEMISM_AUTOMATON = PhraseAutomaton({"softeners": EUPHEMISM_SOFTENERS})
+
 def detect_euphemism(text):
     """
     Flags euphemistic or softened language for editorial modules.
     Uses ML override if available.
     """
-    softeners = [
-        "passed away", "let go", "downsized", "special", "unique",
-        "challenging", "differently abled", "nontraditional", "alternative"
-    ]
-    match = match_phrase(text, softeners)
+    match = bool(EUPHEMISM_AUTOMATON.find_all(text))
 
     try:
         ml_result = run_learning("euphemism_detection", {"text": text})
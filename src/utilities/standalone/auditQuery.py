@@ -0,0 +1,53 @@
+"""
+auditQuery.py — Command-line search over the segmented audit log
+
+Filters audit entries by event type, module, user and time range using the per-segment indexes
+written by audit.py, and prints matches as JSON lines (or just a count). Time bounds accept ISO
+timestamps or relative ages such as 90s, 30m, 1h or 7d.
+Drafted collaboratively with Bob Greenwade and Copilot.
+"""
+
+import argparse
+import json
+import time
+from audit import AuditSegmentStore, audit_settings
+
+RELATIVE_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+def parse_time_bound(value, now=None):
+    """Epoch seconds for "1h"-style ages or ISO timestamps; None passes through."""
+    if value is None:
+        return None
+    now = now if now is not None else time.time()
+    unit = value[-1:].lower()
+    if unit in RELATIVE_UNITS and value[:-1].replace(".", "", 1).isdigit():
+        return now - float(value[:-1]) * RELATIVE_UNITS[unit]
+    return value  # ISO timestamp; AuditSegmentStore parses it
+
+def run_query(directory=None, event=None, module=None, user=None, since=None, until=None, limit=None, count_only=False):
+    settings = audit_settings()
+    store = AuditSegmentStore(directory or settings["directory"], settings["bucket_seconds"], max_segments=None, max_total_bytes=None)
+    since, until = parse_time_bound(since), parse_time_bound(until)
+    if count_only:
+        total = store.count(event, module, user, since, until)
+        print(total)
+        return total
+
+    matched = 0
+    for entry in store.query(event, module, user, since, until, limit):
+        print(json.dumps(entry, default=str))
+        matched += 1
+    return matched
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the DLI audit log.")
+    parser.add_argument("--dir", help="Audit directory (default: audit.directory in config.json)")
+    parser.add_argument("--event", help="Event type, e.g. indulgent_mode_triggered or protocol_trace")
+    parser.add_argument("--module", help="Protocol module, e.g. referToHuman")
+    parser.add_argument("--user", help="Username")
+    parser.add_argument("--since", help="Start time: ISO timestamp or age such as 1h")
+    parser.add_argument("--until", help="End time: ISO timestamp or age such as 10m")
+    parser.add_argument("--limit", type=int, help="Maximum entries to print")
+    parser.add_argument("--count", action="store_true", help="Print only the number of matches")
+    args = parser.parse_args()
+    run_query(args.dir, args.event, args.module, args.user, args.since, args.until, args.limit, args.count)
@@ -76,14 +76,16 @@ def adjust_tone(text, target_tone="neutral"):
 def mirror_phrase(user_input):
     return f"You said: '{user_input}' — let’s unpack that."
 
+ESCALATE_PHRASES = {
+    "emotional_distress": "It’s okay to feel overwhelmed. Let’s take a breath together.",
+    "synthetic_limit": "This is beyond my current scope—let’s bring in a human.",
+    "ethical_boundary": "I’m not equipped to handle this safely. Escalating support.",
+    "loop_detected": "We seem to be circling—let’s pause and reset."
+}
+ESCALATE_FALLBACK = "Let’s bring in support to help with this."
+
 def escalate_phrase(reason):
-    phrases = {
-        "emotional_distress": "It’s okay to feel overwhelmed. Let’s take a breath together.",
-        "synthetic_limit": "This is beyond my current scope—let’s bring in a human.",
-        "ethical_boundary": "I’m not equipped to handle this safely. Escalating support.",
-        "loop_detected": "We seem to be circling—let’s pause and reset."
-    }
-    return phrases.get(reason, "Let’s bring in support to help with this.")
+    return ESCALATE_PHRASES.get(reason, ESCALATE_FALLBACK)
 
 def editorial_rewrite(text, style="lyric"):
     if style == "lyric":
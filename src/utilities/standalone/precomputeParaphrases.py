@@ -0,0 +1,100 @@
+"""
+precomputeParaphrases.py — Offline batch job that paraphrases the static phrase inventory
+
+Paraphrases every mitigation, repeat and escalation phrase for each persona/tone/style combination
+ahead of time and writes the results to the SQLite artifact paraphrase.py reads before calling the LLM
+("paraphrase_precomputed" in config.json). Requests run concurrently, bounded by --concurrency.
+Drafted collaboratively with Bob Greenwade and Copilot.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from itertools import product
+from pathlib import Path
+from paraphrase import build_paraphrase_prompt, preload_personas, write_precomputed, PERSONA_CACHE, precomputed_settings
+from phraseEditor import ESCALATE_PHRASES, ESCALATE_FALLBACK
+from llm import get_llm_client
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+def collect_phrases(data_dir=DATA_DIR):
+    """Returns the unique static phrases from phrases.json, repeatPhrases.json and the escalation set."""
+    phrases = []
+    for filename in ("phrases.json", "repeatPhrases.json"):
+        try:
+            with open(Path(data_dir) / filename, "r", encoding="utf-8") as f:
+                phrases.extend(entry["text"] for entry in json.load(f) if entry.get("text"))
+        except Exception as e:
+            print(f"[PRECOMPUTE] Could not read {filename}: {e}")
+    phrases.extend(ESCALATE_PHRASES.values())
+    phrases.append(ESCALATE_FALLBACK)
+    return list(dict.fromkeys(phrases))
+
+def default_tones(data_dir=DATA_DIR):
+    """The tones map_emotion_to_tone can produce (first entry per emotion), plus no tone at all."""
+    try:
+        with open(Path(data_dir) / "toneMap.json", "r", encoding="utf-8") as f:
+            tones = [entry[0] for entry in json.load(f).values() if entry]
+    except Exception as e:
+        print(f"[PRECOMPUTE] Could not read toneMap.json: {e}")
+        tones = ["neutral"]
+    return [None] + list(dict.fromkeys(tones))
+
+def default_personas():
+    preload_personas()
+    return sorted(PERSONA_CACHE) or ["default"]
+
+async def precompute(phrases, personas, tones, styles=(None,), variants=1, concurrency=8):
+    """
+    Paraphrases every (phrase, persona, tone, style) combination `variants` times.
+    Returns (rows, failures); rows are ready for write_precomputed().
+    """
+    client = get_llm_client()
+    limit = asyncio.Semaphore(concurrency)
+
+    async def run_one(text, persona, tone, style, variant):
+        async with limit:
+            prompt = await asyncio.to_thread(build_paraphrase_prompt, text, persona, tone, style)
+            result = await client.complete_async(prompt)
+        return (text, persona, tone, style, variant, result)
+
+    jobs = [
+        run_one(text, persona, tone, style, variant)
+        for text, persona, tone, style in product(phrases, personas, tones, styles)
+        for variant in range(variants)
+    ]
+    results = await asyncio.gather(*jobs)
+    rows = [row for row in results if row[-1]]
+    return rows, len(results) - len(rows)
+
+def run_precompute(output=None, personas=None, tones=None, styles=None, variants=1, concurrency=8, dry_run=False):
+    output = output or precomputed_settings()["path"]
+    phrases = collect_phrases()
+    personas = personas or default_personas()
+    tones = tones or default_tones()
+    styles = styles or [None]
+    total = len(phrases) * len(personas) * len(tones) * len(styles) * variants
+    print(f"[PRECOMPUTE] {len(phrases)} phrases x {len(personas)} personas x {len(tones)} tones "
+          f"x {len(styles)} styles x {variants} variants = {total} requests")
+    if dry_run:
+        return {"requests": total, "written": 0, "failed": 0}
+
+    start = time.perf_counter()
+    rows, failed = asyncio.run(precompute(phrases, personas, tones, styles, variants, concurrency))
+    written = write_precomputed(output, rows)
+    print(f"[PRECOMPUTE] Wrote {written} paraphrases to {output} in {time.perf_counter() - start:.1f}s ({failed} failed)")
+    return {"requests": total, "written": written, "failed": failed}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute persona paraphrases for the static phrase inventory.")
+    parser.add_argument("--output", help="SQLite artifact path (default: paraphrase_precomputed.path in config.json)")
+    parser.add_argument("--personas", nargs="+", help="Persona names (default: every persona found on disk)")
+    parser.add_argument("--tones", nargs="+", help="Tones (default: no tone plus each tone from toneMap.json)")
+    parser.add_argument("--styles", nargs="+", help="Styles (default: no style)")
+    parser.add_argument("--variants", type=int, default=1, help="Paraphrases to store per combination")
+    parser.add_argument("--concurrency", type=int, default=8, help="Maximum LLM requests in flight")
+    parser.add_argument("--dry-run", action="store_true", help="Only report how many requests would be made")
+    args = parser.parse_args()
+    run_precompute(args.output, args.personas, args.tones, args.styles, args.variants, args.concurrency, args.dry_run)
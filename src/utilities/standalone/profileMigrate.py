@@ -0,0 +1,68 @@
+"""
+profileMigrate.py — Bulk-import JSON user profiles into the SQLite profile backend
+
+Reads every <user>_profile.json under a profile directory and writes it to the SQLite database
+used when PROFILE_BACKEND is "sqlite". Existing rows for a user are replaced, so the tool can be re-run.
+Drafted collaboratively with Bob Greenwade and Copilot.
+"""
+
+import argparse
+from profile import JSONProfileBackend, SQLiteProfileBackend, PROFILE_DIR
+
+def migrate_profiles(profile_dir=PROFILE_DIR, db_path="profiles/profiles.db", batch_size=500):
+    """
+    Copies all JSON profiles into SQLite, committing every batch_size users.
+    Returns counts of migrated and failed profiles.
+    """
+    source = JSONProfileBackend(profile_dir)
+    target = SQLiteProfileBackend(db_path)
+    migrated, failed = 0, []
+
+    usernames = source.list_users()
+    for start in range(0, len(usernames), batch_size):
+        batch = {}
+        for username in usernames[start:start + batch_size]:
+            try:
+                profile = source.load(username)
+                if profile is not None:
+                    batch[username] = profile
+            except Exception as e:
+                failed.append(username)
+                print(f"[MIGRATE] Skipped {username}: {e}")
+        target.save_many(batch)
+        migrated += len(batch)
+        print(f"[MIGRATE] {min(start + batch_size, len(usernames))}/{len(usernames)} profiles processed")
+
+    target.close()
+    print(f"[MIGRATE] Migrated {migrated} profiles to {db_path} ({len(failed)} failed)")
+    return {"migrated": migrated, "failed": failed}
+
+def verify_migration(profile_dir=PROFILE_DIR, db_path="profiles/profiles.db"):
+    """
+    Compares every JSON profile with its SQLite copy. Returns usernames that differ.
+    """
+    source = JSONProfileBackend(profile_dir)
+    target = SQLiteProfileBackend(db_path)
+    mismatched = []
+    for username in source.list_users():
+        original = source.load(username)
+        original.setdefault("profile_characteristics", {})
+        original.setdefault("facts", {})
+        original.setdefault("assertions", [])
+        if target.load(username) != original:
+            mismatched.append(username)
+    target.close()
+    print(f"[MIGRATE] Verification: {len(mismatched)} mismatched profiles")
+    return mismatched
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import JSON user profiles into the SQLite profile backend.")
+    parser.add_argument("--profile-dir", default=PROFILE_DIR, help="directory holding <user>_profile.json files")
+    parser.add_argument("--db", default="profiles/profiles.db", help="SQLite database to write (PROFILE_DB_PATH)")
+    parser.add_argument("--batch-size", type=int, default=500, help="profiles per transaction")
+    parser.add_argument("--verify", action="store_true", help="compare every profile after migrating")
+    args = parser.parse_args()
+
+    migrate_profiles(args.profile_dir, args.db, args.batch_size)
+    if args.verify:
+        verify_migration(args.profile_dir, args.db)
@@ -0,0 +1,138 @@
+"""
+profileStressTest.py — Hammers one user profile from many threads and processes
+
+Every worker increments a shared characteristic, appends assertions, and retries compare-and-set
+updates against the same profile. Afterwards the final profile must account for every update;
+any shortfall means lost updates. Each worker also creates a profile nobody has created yet and sets
+its own characteristic on it, so concurrent first touches must not overwrite each other's profile.
+Uses a scratch profile directory or database, never live profiles.
+Drafted collaboratively with Bob Greenwade and Copilot.
+"""
+
+import argparse
+import multiprocessing
+import shutil
+import tempfile
+import threading
+import profile as profiles
+from profile import ProfileStore, create_profile_backend
+
+USERNAME = "stress_user"
+NEW_USERNAME = "stress_new_user"
+
+def create_profile(store, username):
+    """Same put-if-absent creation as profile.create_user_profile, on the scratch store."""
+    if store.exists(username):
+        return
+    store.put_if_absent(username, {
+        "name": username,
+        "profile_characteristics": {},
+        "facts": {},
+        "assertions": []
+    })
+
+def build_store(backend_name, scratch_dir, process_safe):
+    backend = create_profile_backend(backend_name, {
+        "PROFILE_DIR": scratch_dir,
+        "PROFILE_DB_PATH": f"{scratch_dir}/profiles.db"
+    })
+    return ProfileStore(backend=backend, flush_interval=0 if process_safe else 0.05, process_safe=process_safe)
+
+def worker_thread(store, worker_id, iterations):
+    # First touch of a user that does not exist yet
+    create_profile(store, NEW_USERNAME)
+    store.modify(NEW_USERNAME, lambda p: _set_characteristic(p, worker_id))
+
+    for i in range(iterations):
+        # Plain locked increment
+        store.modify(USERNAME, lambda p: _increment(p, "counter"))
+        # Compare-and-set increment, retried on conflict
+        while True:
+            current = store.read(USERNAME, lambda p: p["profile_characteristics"]["cas_counter"])
+            if store.compare_and_set(USERNAME, ("profile_characteristics", "cas_counter"), current, current + 1):
+                break
+        # Append-only change
+        store.update(USERNAME, lambda p: p.setdefault("assertions", []).append(f"{worker_id}:{i}"),
+                     op=("assertion", f"{worker_id}:{i}"))
+
+def _increment(profile, key):
+    characteristics = profile.setdefault("profile_characteristics", {})
+    characteristics[key] = characteristics.get(key, 0) + 1
+    return characteristics[key], ("characteristic", key, characteristics[key])
+
+def _set_characteristic(profile, key):
+    profile.setdefault("profile_characteristics", {})[key] = True
+    return True, ("characteristic", key, True)
+
+def worker_process(backend_name, scratch_dir, process_id, threads, iterations, process_safe):
+    store = build_store(backend_name, scratch_dir, process_safe)
+    pool = [
+        threading.Thread(target=worker_thread, args=(store, f"p{process_id}t{t}", iterations))
+        for t in range(threads)
+    ]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    store.stop()
+
+def run_stress_test(backend_name="json", processes=4, threads=8, iterations=50):
+    """
+    Runs the stress test and returns expected vs. observed counts.
+    With processes > 1 the store runs in process-safe mode (file locks + write-through).
+    """
+    scratch_dir = tempfile.mkdtemp(prefix="dli_profile_stress_")
+    process_safe = processes > 1
+    try:
+        store = build_store(backend_name, scratch_dir, process_safe)
+        store.put(USERNAME, {
+            "name": USERNAME,
+            "profile_characteristics": {"counter": 0, "cas_counter": 0},
+            "facts": {},
+            "assertions": []
+        })
+        store.stop()
+
+        args = [(backend_name, scratch_dir, p, threads, iterations, process_safe) for p in range(processes)]
+        if processes > 1:
+            workers = [multiprocessing.Process(target=worker_process, args=a) for a in args]
+            for w in workers:
+                w.start()
+            for w in workers:
+                w.join()
+        else:
+            worker_process(*args[0])
+
+        final_store = build_store(backend_name, scratch_dir, process_safe)
+        final = final_store.get(USERNAME)
+        created = final_store.get(NEW_USERNAME) or {}
+        expected = processes * threads * iterations
+        report = {
+            "backend": backend_name,
+            "expected": expected,
+            "counter": final["profile_characteristics"].get("counter", 0),
+            "cas_counter": final["profile_characteristics"].get("cas_counter", 0),
+            "assertions": len(final.get("assertions", [])),
+            "unique_assertions": len(set(final.get("assertions", []))),
+            "expected_first_touch": processes * threads,
+            "first_touch": len(created.get("profile_characteristics", {}))
+        }
+        report["passed"] = (
+            all(report[k] == expected for k in ("counter", "cas_counter", "assertions", "unique_assertions"))
+            and report["first_touch"] == report["expected_first_touch"]
+        )
+        print(f"[STRESS] {report}")
+        return report
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrency stress test for profile updates.")
+    parser.add_argument("--backend", choices=sorted(profiles.PROFILE_BACKENDS), default="json")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    result = run_stress_test(args.backend, args.processes, args.threads, args.iterations)
+    raise SystemExit(0 if result["passed"] else 1)
@@ -1,75 +1,363 @@
-```python
 """
 transcript.py — Context-aware transcript logging for DLI
 
 Captures conversation history when triggered, with pre-escalation context.
+Each conversation (session id) gets its own context buffer and transcript in a TranscriptManager;
+idle sessions are evicted and total buffered entries are capped, so one process can serve
+thousands of conversations. Active transcripts are streamed to an <id>.txt.part file: turns are
+held in memory and appended every flush_interval seconds by a background thread (or sooner, every
+PENDING_LINE_LIMIT lines), opening the file only for the write, so no file handles stay open between turns. save_transcript() only
+flushes and renames it. The module-level functions act on the "default" session unless a session_id is given.
 Drafted collaboratively with Copilot.
 """
 
 import os
 import json
+import atexit
+import threading
+import time
+from collections import OrderedDict, deque
 from datetime import datetime
+from config import load_config, subscribe_config
+from logger import log_transcript_creation
 
-# Load config
-def load_config(path="config.json"):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-CONFIG = load_config()
-BUFFER_SIZE = CONFIG.get("TRANSCRIPT_CONTEXT_BUFFER_SIZE", 10)
-
-# Buffers and logs
-context_buffer = []
-transcript_log = []
-transcript_active = False
-transcript_trigger = None
-
-def update_context_buffer(turn):
-    context_buffer.append(turn)
-    if len(context_buffer) > BUFFER_SIZE:
-        context_buffer.pop(0)
-
-def start_transcript(trigger_type="automatic"):
-    global transcript_active, transcript_trigger
-    if not transcript_active:
-        transcript_log.extend(context_buffer)
-        transcript_trigger = trigger_type
-        transcript_active = True
-        print(f"[TRANSCRIPT] Started via {trigger_type}")
-
-def append_to_transcript(speaker, text, metadata=None):
-    if transcript_active:
-        entry = {
-            "timestamp": datetime.now().isoformat(),
-            "speaker": speaker,
-            "text": text,
-            "metadata": metadata or {}
-        }
-        transcript_log.append(entry)
-        
-def save_transcript(username="User"):
-    if not transcript_active:
-        print("[TRANSCRIPT] No active transcript to save.")
-        return None
-
-    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-    filename = f"{username}_{timestamp}.txt"
-
-    with open(filename, "w", encoding="utf-8") as f:
-        f.write(f"Transcript triggered by: {transcript_trigger}\n\n")
-        for entry in transcript_log:
-            line = f"{entry['speaker']}: {entry['text']}"
-            if entry["metadata"]:
-                line += f" [{entry['metadata']}]"
-            f.write(line + "\n")
-
-    print(f"[TRANSCRIPT] Saved to {filename}")
-    log_transcript_creation(filename, transcript_trigger)  # See below
-    reset_transcript()
-    return filename
-
-def reset_transcript():
-    global transcript_log, transcript_active, transcript_trigger
-    transcript_log = []
-    transcript_active = False
-    transcript_trigger = None
+TRANSCRIPT_DEFAULTS = {
+    "idle_timeout": 1800,      # Seconds without activity before a session is evicted
+    "max_sessions": 10000,
+    "max_entries": 200000,     # Buffered turns across all sessions
+    "sweep_interval": 60,
+    "directory": "",           # Where transcripts are written ("" = working directory)
+    "flush_interval": 1.0
+}
+
+PENDING_LINE_LIMIT = 256  # Transcript lines held per session before an early flush
+
+def transcript_settings(config=None):
+    config = config if config is not None else load_config()
+    return {
+        **TRANSCRIPT_DEFAULTS,
+        **config.get("transcripts", {}),
+        "buffer_size": config.get("TRANSCRIPT_CONTEXT_BUFFER_SIZE", 10)
+    }
+
+def format_transcript_line(entry):
+    line = f"{entry['speaker']}: {entry['text']}"
+    if entry["metadata"]:
+        line += f" [{entry['metadata']}]"
+    return line + "\n"
+
+class TranscriptSession:
+    """Context buffer and (once started) the transcript .part file and unwritten lines for one conversation."""
+
+    def __init__(self, session_id, buffer_size):
+        self.session_id = session_id
+        self.context_buffer = deque(maxlen=buffer_size)
+        self.active = False
+        self.trigger = None
+        self.started = None
+        self.part_path = None
+        self.pending = []
+        self.lines = 0
+        self.last_flush = 0.0
+        self.last_seen = time.monotonic()
+
+    def size(self):
+        return len(self.context_buffer)
+
+    def write(self, entry, flush_interval):
+        self.pending.append(format_transcript_line(entry))
+        self.lines += 1
+        if len(self.pending) >= PENDING_LINE_LIMIT or time.monotonic() - self.last_flush >= flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Appends unwritten lines to the .part file; they stay pending if the write fails."""
+        if self.pending and self.part_path:
+            with open(self.part_path, "a", encoding="utf-8") as f:
+                f.writelines(self.pending)
+            self.pending.clear()
+        self.last_flush = time.monotonic()
+
+    def clear(self):
+        self.active = False
+        self.trigger = None
+        self.part_path = None
+        self.pending.clear()
+        self.lines = 0
+
+class TranscriptManager:
+    """
+    Sessions keyed by session id, kept in least-recently-used order.
+    Sessions idle for idle_timeout seconds are evicted on a periodic sweep; past max_sessions
+    or max_entries the least recently used sessions go first. Sessions with an active transcript
+    are never evicted (an escalation may wait a long time for a human) and do not count toward
+    max_sessions; they leave only through save_transcript(), reset_transcript() or end_session().
+    """
+
+    def __init__(self, buffer_size=10, idle_timeout=TRANSCRIPT_DEFAULTS["idle_timeout"],
+                 max_sessions=TRANSCRIPT_DEFAULTS["max_sessions"], max_entries=TRANSCRIPT_DEFAULTS["max_entries"],
+                 sweep_interval=TRANSCRIPT_DEFAULTS["sweep_interval"], directory=TRANSCRIPT_DEFAULTS["directory"],
+                 flush_interval=TRANSCRIPT_DEFAULTS["flush_interval"]):
+        self.buffer_size = buffer_size
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.max_entries = max_entries
+        self.sweep_interval = sweep_interval
+        self._sessions = OrderedDict()
+        self._entries = 0
+        self._active = 0  # Sessions with an active transcript (exempt from eviction)
+        self._last_sweep = time.monotonic()
+        self._lock = threading.RLock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.evictions = 0
+
+    def configure(self, buffer_size=None, idle_timeout=None, max_sessions=None, max_entries=None, sweep_interval=None,
+                  directory=None, flush_interval=None):
+        with self._lock:
+            if directory is not None:
+                self.directory = directory  # Applies to transcripts started from now on
+            if flush_interval is not None:
+                self.flush_interval = flush_interval
+            if buffer_size is not None and buffer_size != self.buffer_size:
+                self.buffer_size = buffer_size
+                for session in self._sessions.values():
+                    before = len(session.context_buffer)
+                    session.context_buffer = deque(session.context_buffer, maxlen=buffer_size)
+                    self._entries -= before - len(session.context_buffer)
+            if idle_timeout is not None:
+                self.idle_timeout = idle_timeout
+            if max_sessions is not None:
+                self.max_sessions = max_sessions
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if sweep_interval is not None:
+                self.sweep_interval = sweep_interval
+            self._enforce_limits()
+
+    def _session(self, session_id):
+        """Returns the session (creating it), marked as most recently used. Caller holds the lock."""
+        now = time.monotonic()
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = TranscriptSession(session_id, self.buffer_size)
+        else:
+            self._sessions.move_to_end(session_id)
+        session.last_seen = now
+        if now - self._last_sweep >= self.sweep_interval:
+            self._last_sweep = now
+            self.evict_idle(now)
+            self.flush_all()
+        return session
+
+    def _drop(self, session_id):
+        session = self._sessions.pop(session_id)
+        self._entries -= session.size()
+        self.evictions += 1
+
+    def evict_idle(self, now=None):
+        """Evicts sessions idle longer than idle_timeout. Returns the number evicted."""
+        now = now if now is not None else time.monotonic()
+        with self._lock:
+            idle = [
+                sid for sid, s in self._sessions.items()
+                if not s.active and now - s.last_seen > self.idle_timeout
+            ]
+            for session_id in idle:
+                self._drop(session_id)
+            return len(idle)
+
+    def _enforce_limits(self, keep=None):
+        while len(self._sessions) - self._active > self.max_sessions or self._entries > self.max_entries:
+            victim = next((sid for sid, s in self._sessions.items() if sid != keep and not s.active), None)
+            if victim is None:
+                break
+            self._drop(victim)
+
+    def update_context_buffer(self, session_id, turn):
+        with self._lock:
+            session = self._session(session_id)
+            if len(session.context_buffer) < session.context_buffer.maxlen:
+                self._entries += 1
+            session.context_buffer.append(turn)
+            self._enforce_limits(keep=session_id)
+
+    def start_transcript(self, session_id, trigger_type="automatic"):
+        with self._lock:
+            session = self._session(session_id)
+            if not session.active:
+                session.started = datetime.now()
+                session.part_path = os.path.join(
+                    self.directory, f"{session_id}_{session.started.strftime('%Y%m%d-%H%M%S')}.txt.part"
+                )
+                if self.directory:
+                    os.makedirs(self.directory, exist_ok=True)
+                with open(session.part_path, "w", encoding="utf-8") as f:
+                    f.write(f"Transcript triggered by: {trigger_type}\n\n")
+                    f.writelines(format_transcript_line(turn) for turn in session.context_buffer)
+                session.lines = len(session.context_buffer)
+                session.last_flush = time.monotonic()
+                session.trigger = trigger_type
+                session.active = True
+                self._active += 1
+                print(f"[TRANSCRIPT] Started via {trigger_type}")
+        self.start()
+
+    def append_to_transcript(self, session_id, speaker, text, metadata=None):
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or not session.active:
+                return
+            self._session(session_id)
+            try:
+                session.write({
+                    "timestamp": datetime.now().isoformat(),
+                    "speaker": speaker,
+                    "text": text,
+                    "metadata": metadata or {}
+                }, self.flush_interval)
+            except OSError as e:
+                # The turn stays pending; the next flush retries it
+                print(f"[TRANSCRIPT] Could not flush {session.part_path}: {e}")
+
+    def is_active(self, session_id):
+        session = self._sessions.get(session_id)
+        return bool(session and session.active)
+
+    def flush_all(self):
+        """Writes every active transcript's pending lines to its .part file."""
+        with self._lock:
+            for session in self._sessions.values():
+                if session.active:
+                    try:
+                        session.flush()
+                    except OSError as e:
+                        print(f"[TRANSCRIPT] Could not flush {session.part_path}: {e}")
+
+    def start(self):
+        """Starts the background flush thread (called automatically when a transcript starts)."""
+        if self._thread is None and self.flush_interval:
+            with self._lock:
+                if self._thread is None:
+                    self._stop_event.clear()
+                    self._thread = threading.Thread(target=self._run, name="dli-transcript-flush", daemon=True)
+                    self._thread.start()
+        return self
+
+    def _run(self):
+        # flush_interval may be set to 0 later (write-through); keep the sweep from spinning
+        while not self._stop_event.wait(self.flush_interval or TRANSCRIPT_DEFAULTS["flush_interval"]):
+            self.flush_all()
+
+    def stop(self):
+        """Stops the flush thread and writes anything still pending."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush_all()
+
+    def _finalize(self, session, username):
+        """Flushes and renames the .part file; on failure the session stays active so it can be retried."""
+        filename = os.path.join(self.directory, f"{username}_{session.started.strftime('%Y%m%d-%H%M%S')}.txt")
+        try:
+            session.flush()
+            os.replace(session.part_path, filename)
+        except OSError as e:
+            print(f"[TRANSCRIPT] Could not save {session.part_path}: {e}")
+            return None
+        print(f"[TRANSCRIPT] Saved to {filename}")
+        log_transcript_creation(filename, session.trigger)
+        session.clear()
+        self._active -= 1
+        return filename
+
+    def save_transcript(self, session_id, username="User"):
+        """Flushes the session's transcript and renames it to <username>_<start time>.txt."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or not session.active:
+                print("[TRANSCRIPT] No active transcript to save.")
+                return None
+            return self._finalize(session, username)
+
+    def reset_transcript(self, session_id):
+        """Discards the session's transcript, if any."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return
+            if session.active:
+                try:
+                    os.remove(session.part_path)
+                except FileNotFoundError:
+                    pass
+                self._active -= 1
+            session.clear()
+
+    def end_session(self, session_id):
+        """Drops a finished conversation without saving it."""
+        with self._lock:
+            self.reset_transcript(session_id)
+            session = self._sessions.pop(session_id, None)
+            if session:
+                self._entries -= session.size()
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "active_transcripts": self._active,
+                "entries": self._entries,
+                "evictions": self.evictions
+            }
+
+DEFAULT_SESSION = "default"
+
+_settings = transcript_settings()
+BUFFER_SIZE = _settings["buffer_size"]
+TRANSCRIPTS = TranscriptManager(
+    buffer_size=BUFFER_SIZE,
+    idle_timeout=_settings["idle_timeout"],
+    max_sessions=_settings["max_sessions"],
+    max_entries=_settings["max_entries"],
+    sweep_interval=_settings["sweep_interval"],
+    directory=_settings["directory"],
+    flush_interval=_settings["flush_interval"]
+)
+
+# Leave in-progress .part files complete up to the last turn
+atexit.register(TRANSCRIPTS.stop)
+
+def _on_config_reload(config, previous):
+    global BUFFER_SIZE
+    settings = transcript_settings(config)
+    BUFFER_SIZE = settings["buffer_size"]
+    TRANSCRIPTS.configure(
+        buffer_size=BUFFER_SIZE,
+        idle_timeout=settings["idle_timeout"],
+        max_sessions=settings["max_sessions"],
+        max_entries=settings["max_entries"],
+        sweep_interval=settings["sweep_interval"],
+        directory=settings["directory"],
+        flush_interval=settings["flush_interval"]
+    )
+
+subscribe_config(_on_config_reload)
+
+def update_context_buffer(turn, session_id=DEFAULT_SESSION):
+    TRANSCRIPTS.update_context_buffer(session_id, turn)
+
+def start_transcript(trigger_type="automatic", session_id=DEFAULT_SESSION):
+    TRANSCRIPTS.start_transcript(session_id, trigger_type)
+
+def append_to_transcript(speaker, text, metadata=None, session_id=DEFAULT_SESSION):
+    TRANSCRIPTS.append_to_transcript(session_id, speaker, text, metadata)
+
+def save_transcript(username="User", session_id=DEFAULT_SESSION):
+    return TRANSCRIPTS.save_transcript(session_id, username)
+
+def reset_transcript(session_id=DEFAULT_SESSION):
+    TRANSCRIPTS.reset_transcript(session_id)